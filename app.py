@@ -1,21 +1,34 @@
 import typer
 from typing import Optional
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
+from rich.table import Table
 from rich.text import Text
 import time
 
-# Add current directory to path for imports
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# `python app.py` already puts this directory first on sys.path, so the
+# `src` package resolves without patching the import path
 
-# Import our agents
-from src.agent.ticker_analyzer import TickerAnalyzerAgent, analyze_ticker
-from src.agent.investment_recommender import InvestmentRecommenderAgent, get_investment_recommendation
+# Agents are imported inside each command: they pull in LangGraph, FAISS,
+# sentence-transformers and matplotlib, which `config` and `--help` never need
 
 app = typer.Typer(help="🚀 AI-Powered Ticker Analyzer & Investment Recommender")
-console = Console()
+console = Console(record=False, highlight=False)
+
+# Display colors for recommendation categories and risk levels
+REC_COLOR = {'STRONG BUY': 'green', 'BUY': 'green', 'HOLD': 'yellow', 'WEAK HOLD': 'yellow', 'SELL': 'red'}
+RISK_COLOR = {'high': 'red', 'medium': 'yellow', 'low': 'green'}
+
+
+def _score_table(rows) -> Table:
+    """Render label/value score rows as one borderless, indented table"""
+    table = Table(box=None, show_header=False, padding=(0, 1, 0, 2))
+    table.add_column()
+    table.add_column()
+    for label, value in rows:
+        table.add_row(label, value)
+    return table
 
 
 @app.command("analyze")
@@ -56,10 +69,13 @@ def analyze_company(
         start_time = time.time()
         
         with console.status(f"[bold green]Analyzing {ticker} (RAG + Workflow Enhanced)..."):
+            from src.agent.ticker_analyzer import TickerAnalyzerAgent
+            
             # Create analyzer instance for enhanced features
             analyzer = TickerAnalyzerAgent(use_llm=llm)
             
-            # Run enhanced analysis with RAG and workflow
+            # Run enhanced analysis with RAG and workflow on a single event loop
+            # (the blocking wrapper also closes the loop's async LLM client)
             analysis_result = analyzer.analyze_ticker_comprehensive(
                 ticker, 
                 force_new=force_new,
@@ -74,32 +90,40 @@ def analyze_company(
             overall_scores = analysis_result.get('overall_scores', {})
             is_cached = analysis_result.get('is_cached', False)
             
-            console.print("\n" + "="*60)
+            renderables = ["\n" + "="*60]
             if is_cached:
                 cache_age = analysis_result.get('cache_age_days', 0)
-                console.print(f"[bold blue]Using Cached Analysis for {ticker}[/bold blue]")
-                console.print(f"[dim]Cache age: {cache_age} days old[/dim]")
+                renderables.append(f"[bold blue]Using Cached Analysis for {ticker}[/bold blue]")
+                renderables.append(f"[dim]Cache age: {cache_age} days old[/dim]")
             else:
-                console.print(f"[bold green]Analysis Complete for {ticker}[/bold green]")
-                console.print(f"[dim]Analysis time: {analysis_time:.1f} seconds[/dim]")
+                renderables.append(f"[bold green]Analysis Complete for {ticker}[/bold green]")
+                token_usage = analysis_result.get('token_usage', {})
+                renderables.append(
+                    f"[dim]Analysis time: {analysis_time:.1f} seconds | "
+                    f"Tokens: {token_usage.get('input_tokens', 0)} in / {token_usage.get('output_tokens', 0)} out[/dim]"
+                )
             
             # Display key scores
             if overall_scores:
-                console.print("\n[bold]📊 Key Scores:[/bold]")
-                console.print(f"  🔬 Future Focus (R&D): [cyan]{overall_scores.get('future_focus_score', 'N/A')}/10[/cyan]")
-                console.print(f"  👤 Leadership Impact: [cyan]{overall_scores.get('leadership_score', 'N/A')}/10[/cyan]")
-                console.print(f"  💻 Technology Score: [cyan]{overall_scores.get('technology_score', 'N/A')}/10[/cyan]")
-                console.print(f"  💰 Financial Health: [cyan]{overall_scores.get('financial_health_score', 'N/A')}/10[/cyan]")
-                console.print(f"  📈 Market Sentiment: [cyan]{overall_scores.get('sentiment_score', 'N/A'):.1f}/10[/cyan]")
-                console.print(f"  🎯 Overall Investment Score: [bold cyan]{overall_scores.get('overall_investment_score', 'N/A')}/10[/bold cyan]")
-                console.print(f"  ⚠️  Risk Level: [{'red' if overall_scores.get('risk_level') == 'high' else 'yellow' if overall_scores.get('risk_level') == 'medium' else 'green'}]{overall_scores.get('risk_level', 'N/A').upper()}[/]")
+                renderables.append("\n[bold]📊 Key Scores:[/bold]")
+                renderables.append(_score_table([
+                    ("🔬 Future Focus (R&D):", f"[cyan]{overall_scores.get('future_focus_score', 'N/A')}/10[/cyan]"),
+                    ("👤 Leadership Impact:", f"[cyan]{overall_scores.get('leadership_score', 'N/A')}/10[/cyan]"),
+                    ("💻 Technology Score:", f"[cyan]{overall_scores.get('technology_score', 'N/A')}/10[/cyan]"),
+                    ("💰 Financial Health:", f"[cyan]{overall_scores.get('financial_health_score', 'N/A')}/10[/cyan]"),
+                    ("📈 Market Sentiment:", f"[cyan]{overall_scores.get('sentiment_score', 'N/A'):.1f}/10[/cyan]"),
+                    ("🎯 Overall Investment Score:", f"[bold cyan]{overall_scores.get('overall_investment_score', 'N/A')}/10[/bold cyan]"),
+                    ("⚠️  Risk Level:", f"[{RISK_COLOR.get(overall_scores.get('risk_level'), 'green')}]{overall_scores.get('risk_level', 'N/A').upper()}[/]")
+                ]))
             
             # Display file locations
             report_files = analysis_result.get('report_files', {})
             if 'report_file' in report_files:
-                console.print(f"\n[bold]Reports saved to:[/bold]")
-                console.print(f"  Full Report: [green]{report_files['report_file']}[/green]")
-                console.print(f"  Data Folder: [green]{report_files.get('ticker_folder', 'N/A')}[/green]")
+                renderables.append(f"\n[bold]Reports saved to:[/bold]")
+                renderables.append(f"  Full Report: [green]{report_files['report_file']}[/green]")
+                renderables.append(f"  Data Folder: [green]{report_files.get('ticker_folder', 'N/A')}[/green]")
+            
+            console.print(Group(*renderables))
             
         else:
             error_msg = analysis_result['error']
@@ -119,6 +143,8 @@ def analyze_company(
             console.print("[bold yellow]💡 Generating Investment Recommendation...[/bold yellow]")
             
             try:
+                from src.agent.investment_recommender import get_investment_recommendation
+                
                 with console.status(f"[bold yellow]Analyzing investment potential for {ticker}..."):
                     recommendation = get_investment_recommendation(ticker, use_llm=llm)
                 
@@ -127,34 +153,27 @@ def analyze_company(
                     score = recommendation['overall_score']
                     confidence = recommendation['confidence_level']
                     
-                    # Color code the recommendation
-                    if 'BUY' in rec_text:
-                        rec_color = 'green'
-                    elif 'HOLD' in rec_text:
-                        rec_color = 'yellow'
-                    else:
-                        rec_color = 'red'
+                    rec_color = REC_COLOR.get(rec_text, 'red')
                     
-                    console.print(Panel(
+                    renderables = [Panel(
                         f"[bold {rec_color}]{rec_text}[/bold {rec_color}]\n"
                         f"[cyan]Score: {score}/10[/cyan]\n"
                         f"[cyan]Confidence: {confidence}[/cyan]",
                         title=f"🎯 Investment Recommendation for {ticker}",
                         border_style=rec_color
-                    ))
+                    )]
                     
                     # Show key points
                     if recommendation.get('key_opportunities'):
-                        console.print("\n[bold green]🚀 Key Opportunities:[/bold green]")
-                        for opp in recommendation['key_opportunities'][:3]:
-                            console.print(f"  • {opp}")
+                        renderables.append("\n[bold green]🚀 Key Opportunities:[/bold green]")
+                        renderables.extend(f"  • {opp}" for opp in recommendation['key_opportunities'][:3])
                     
                     if recommendation.get('key_risks'):
-                        console.print("\n[bold red]⚠️  Key Risks:[/bold red]")
-                        for risk in recommendation['key_risks'][:3]:
-                            console.print(f"  • {risk}")
+                        renderables.append("\n[bold red]⚠️  Key Risks:[/bold red]")
+                        renderables.extend(f"  • {risk}" for risk in recommendation['key_risks'][:3])
                     
-                    console.print(f"\n[bold]📄 Recommendation report:[/bold] [green]{recommendation.get('report_path', 'N/A')}[/green]")
+                    renderables.append(f"\n[bold]📄 Recommendation report:[/bold] [green]{recommendation.get('report_path', 'N/A')}[/green]")
+                    console.print(Group(*renderables))
                 
                 else:
                     console.print(f"[red]❌ Recommendation failed: {recommendation['error']}[/red]")
@@ -190,57 +209,74 @@ def recommend_only(
     ))
     
     try:
-        with console.status(f"[bold yellow]Analyzing investment potential for {ticker}..."):
-            recommendation = get_investment_recommendation(ticker, use_llm=llm)
+        from src.agent.investment_recommender import get_investment_recommendation
+        
+        # Stream the LLM reasoning into a live panel as it is generated
+        streamed = []
+        
+        def _reasoning_panel() -> Panel:
+            return Panel(
+                Text("".join(streamed) or "Analyzing investment potential..."),
+                title=f"🧠 Reasoning for {ticker}",
+                border_style="yellow"
+            )
+        
+        with Live(_reasoning_panel(), console=console, refresh_per_second=12) as live:
+            def _on_token(chunk: str):
+                streamed.append(chunk)
+                live.update(_reasoning_panel())
+            
+            recommendation = get_investment_recommendation(ticker, use_llm=llm, on_token=_on_token)
         
         if 'error' not in recommendation:
             rec_text = recommendation['recommendation']
             score = recommendation['overall_score']
             confidence = recommendation['confidence_level']
             
-            # Color code the recommendation
-            if 'BUY' in rec_text:
-                rec_color = 'green'
-            elif 'HOLD' in rec_text:
-                rec_color = 'yellow'
-            else:
-                rec_color = 'red'
+            rec_color = REC_COLOR.get(rec_text, 'red')
             
-            console.print(Panel(
+            renderables = [Panel(
                 f"[bold {rec_color}]{rec_text}[/bold {rec_color}]\n"
                 f"[cyan]Score: {score}/10[/cyan]\n"
                 f"[cyan]Confidence: {confidence}[/cyan]",
                 title=f"🎯 Investment Recommendation for {ticker}",
                 border_style=rec_color
-            ))
+            )]
             
             # Show detailed scores
             detailed = recommendation.get('detailed_scores', {})
             if detailed:
-                console.print("\n[bold]📊 Detailed Scores:[/bold]")
-                console.print(f"  🔬 Growth Potential: [cyan]{detailed.get('growth_potential', 'N/A')}/10[/cyan]")
-                console.print(f"  💰 Financial Stability: [cyan]{detailed.get('financial_stability', 'N/A')}/10[/cyan]")
-                console.print(f"  👤 Leadership Quality: [cyan]{detailed.get('leadership_quality', 'N/A')}/10[/cyan]")
-                console.print(f"  💻 Innovation Capacity: [cyan]{detailed.get('innovation_capacity', 'N/A')}/10[/cyan]")
-                console.print(f"  📈 Market Sentiment: [cyan]{detailed.get('market_sentiment', 'N/A'):.1f}/10[/cyan]")
+                renderables.append("\n[bold]📊 Detailed Scores:[/bold]")
+                renderables.append(_score_table([
+                    ("🔬 Growth Potential:", f"[cyan]{detailed.get('growth_potential', 'N/A')}/10[/cyan]"),
+                    ("💰 Financial Stability:", f"[cyan]{detailed.get('financial_stability', 'N/A')}/10[/cyan]"),
+                    ("👤 Leadership Quality:", f"[cyan]{detailed.get('leadership_quality', 'N/A')}/10[/cyan]"),
+                    ("💻 Innovation Capacity:", f"[cyan]{detailed.get('innovation_capacity', 'N/A')}/10[/cyan]"),
+                    ("📈 Market Sentiment:", f"[cyan]{detailed.get('market_sentiment', 'N/A'):.1f}/10[/cyan]")
+                ]))
             
             # Show time horizon recommendations
             time_horizon = recommendation.get('time_horizon_recommendations', {})
             if time_horizon:
-                console.print("\n[bold]⏰ Time Horizon Fit:[/bold]")
-                console.print(f"  📅 Long-term (3+ years): [cyan]{time_horizon.get('long_term', 'N/A').title()}[/cyan]")
-                console.print(f"  📅 Medium-term (1-3 years): [cyan]{time_horizon.get('medium_term', 'N/A').title()}[/cyan]")
-                console.print(f"  📅 Short-term (<1 year): [cyan]{time_horizon.get('short_term', 'N/A').title()}[/cyan]")
+                renderables.append("\n[bold]⏰ Time Horizon Fit:[/bold]")
+                renderables.append(_score_table([
+                    ("📅 Long-term (3+ years):", f"[cyan]{time_horizon.get('long_term', 'N/A').title()}[/cyan]"),
+                    ("📅 Medium-term (1-3 years):", f"[cyan]{time_horizon.get('medium_term', 'N/A').title()}[/cyan]"),
+                    ("📅 Short-term (<1 year):", f"[cyan]{time_horizon.get('short_term', 'N/A').title()}[/cyan]")
+                ]))
             
             # Show investment style fit
             style_fit = recommendation.get('investment_style_fit', {})
             if style_fit:
-                console.print("\n[bold]🎨 Investment Style Fit:[/bold]")
-                console.print(f"  📈 Growth Investing: [cyan]{style_fit.get('growth', 'N/A').title()}[/cyan]")
-                console.print(f"  💎 Value Investing: [cyan]{style_fit.get('value', 'N/A').title()}[/cyan]")
-                console.print(f"  🚀 Innovation Focus: [cyan]{style_fit.get('innovation', 'N/A').title()}[/cyan]")
+                renderables.append("\n[bold]🎨 Investment Style Fit:[/bold]")
+                renderables.append(_score_table([
+                    ("📈 Growth Investing:", f"[cyan]{style_fit.get('growth', 'N/A').title()}[/cyan]"),
+                    ("💎 Value Investing:", f"[cyan]{style_fit.get('value', 'N/A').title()}[/cyan]"),
+                    ("🚀 Innovation Focus:", f"[cyan]{style_fit.get('innovation', 'N/A').title()}[/cyan]")
+                ]))
             
-            console.print(f"\n[bold]📄 Full recommendation report:[/bold] [green]{recommendation.get('report_path', 'N/A')}[/green]")
+            renderables.append(f"\n[bold]📄 Full recommendation report:[/bold] [green]{recommendation.get('report_path', 'N/A')}[/green]")
+            console.print(Group(*renderables))
         
         else:
             console.print(f"[red]❌ Recommendation failed: {recommendation['error']}[/red]")
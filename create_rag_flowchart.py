@@ -1,15 +1,45 @@
 #!/usr/bin/env python3
 """
 Create RAG Flow Chart for AI Ticker Analyzer
+
+Build-time script: the rendered RAG_Flow_Chart.png is committed alongside the
+README, so this only needs re-running after the chart below is edited.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch
-import numpy as np
+import hashlib
+import sys
+from pathlib import Path
+
+OUTPUT_FILE = Path('RAG_Flow_Chart.png')
+DIGEST_KEY = 'Source-Digest'
+
+
+def _source_digest() -> str:
+    """Hash of this script, i.e. of the box/arrow spec the chart is drawn from"""
+    return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
 
-def create_rag_flowchart():
+
+def _chart_is_current(digest: str) -> bool:
+    """True if the existing PNG was rendered from the current spec
+    
+    The digest is stored as an uncompressed PNG tEXt chunk, so a byte search
+    is enough to find it without decoding the image.
+    """
+    if not OUTPUT_FILE.exists():
+        return False
+    return f"{DIGEST_KEY}\x00{digest}".encode('latin-1') in OUTPUT_FILE.read_bytes()
+
+
+def create_rag_flowchart(force: bool = False):
     """Create a comprehensive RAG flow chart"""
+    digest = _source_digest()
+    if not force and _chart_is_current(digest):
+        print(f"[OK] RAG Flow Chart is up to date: {OUTPUT_FILE}")
+        return
+    
+    # matplotlib is only needed when the chart is actually rendered
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import FancyBboxPatch
     
     fig, ax = plt.subplots(1, 1, figsize=(16, 12))
     
@@ -131,10 +161,10 @@ def create_rag_flowchart():
            ha='center', va='center', fontsize=12, style='italic')
     
     plt.tight_layout()
-    plt.savefig('RAG_Flow_Chart.png', dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(OUTPUT_FILE, dpi=300, bbox_inches='tight', facecolor='white', metadata={DIGEST_KEY: digest})
     plt.close()
     
-    print("[OK] RAG Flow Chart created: RAG_Flow_Chart.png")
+    print(f"[OK] RAG Flow Chart created: {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    create_rag_flowchart()
\ No newline at end of file
+    create_rag_flowchart(force='--force' in sys.argv)
\ No newline at end of file
@@ -2,10 +2,24 @@
 from smolagents import CodeAgent
 from src.config import llm
 
-def build_base_agent():
+
+class ZeroToolAgent:
+    """Single-shot stand-in for CodeAgent when there are no tools to call"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def run(self, task: str) -> str:
+        response = self.model([{"role": "user", "content": [{"type": "text", "text": task}]}])
+        return response.content
+
+
+def build_base_agent(tools=None):
+    # Without tools the CodeAgent loop can only re-query the model, so answer in one call
+    if not tools:
+        return ZeroToolAgent(llm)
     return CodeAgent(
         model=llm,
-        tools=[],
+        tools=tools,
         max_steps=3
     )
-
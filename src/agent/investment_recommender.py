@@ -1,10 +1,138 @@
+import bisect
+import functools
+import itertools
 import json
 import os
-from typing import Dict, Any, List, Tuple
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple, Callable, Optional
 from datetime import datetime
 from pathlib import Path
 
-from src.config import default_llm, llm_type, get_gemini_model, get_openai_model
+import numpy as np
+
+from src.config import get_gemini_model, get_openai_model
+from src.utils.json_utils import dumps_json, load_json
+from src.utils.llm_cache import llm_response_cache
+
+# Filename marker -> analysis key for saved analysis files
+ANALYSIS_FILE_CATEGORIES = (
+    ('cash_flow', 'financial_analysis'),
+    ('financial', 'financial_analysis'),
+    ('ceo', 'ceo_analysis'),
+    ('leadership', 'ceo_analysis'),
+    ('technology', 'technology_analysis'),
+    ('sentiment', 'sentiment_analysis'),
+    ('profit', 'profit_analysis'),
+)
+ANALYSIS_FILE_MARKERS = dict(ANALYSIS_FILE_CATEGORIES)
+# One alternation scanned once per filename; the leftmost marker in the name wins
+ANALYSIS_FILE_PATTERN = re.compile('|'.join(re.escape(marker) for marker, _ in ANALYSIS_FILE_CATEGORIES))
+
+
+# Investment metrics feeding the overall score, and their weights
+METRIC_KEYS = ('growth_potential', 'financial_stability', 'leadership_quality', 'innovation_capacity', 'market_sentiment')
+METRIC_WEIGHTS = np.array([0.25, 0.25, 0.15, 0.20, 0.15])
+
+# Lower score bounds of each recommendation category above SELL, ascending
+RECOMMENDATION_THRESHOLDS = (3.5, 5.0, 6.5, 8.0)
+RECOMMENDATION_CATEGORIES = (
+    ("SELL", "High"),
+    ("WEAK HOLD", "Medium-Low"),
+    ("HOLD", "Medium"),
+    ("BUY", "Medium-High"),
+    ("STRONG BUY", "High"),
+)
+
+# Static analyst instructions. They lead every reasoning request unchanged so
+# provider-side prompt-prefix caching can reuse them; only the short
+# per-ticker details that follow vary between calls.
+REASONING_INSTRUCTIONS = """You are an expert financial analyst providing investment recommendations.
+
+For the recommendation and metrics given below, provide a comprehensive analysis covering:
+1. Primary reasons supporting this recommendation
+2. Key risk factors to monitor
+3. Catalysts that could change the outlook
+4. Ideal holding period and investment approach
+
+Keep the analysis professional, specific, and actionable. Limit to 400 words."""
+
+# Per-ticker details appended after the instructions. Scores are bucketed and the
+# factor lists sorted before rendering, so equal inputs give identical prompts.
+REASONING_PROMPT_TEMPLATE = """Provide detailed reasoning for the {recommendation} recommendation for {ticker}.
+
+Key metrics:
+- Growth Potential: {growth_potential}/10
+- Financial Stability: {financial_stability}/10
+- Leadership Quality: {leadership_quality}/10
+- Innovation Capacity: {innovation_capacity}/10
+- Market Sentiment: {market_sentiment}/10
+
+Key Risks: {risks}
+Key Opportunities: {opportunities}"""
+
+
+@functools.lru_cache(maxsize=2)
+def _get_llm(use_llm: str) -> Tuple[Any, str]:
+    """Create the LLM client for a preference once, falling back to the other provider"""
+    if use_llm == "gemini":
+        try:
+            llm, llm_type = get_gemini_model(), "gemini"
+        except ValueError:
+            llm, llm_type = get_openai_model(), "openai"
+    else:
+        try:
+            llm, llm_type = get_openai_model(), "openai"
+        except ValueError:
+            llm, llm_type = get_gemini_model(), "gemini"
+    
+    print(f"✅ Investment Recommender Agent initialized with {llm_type.upper()} LLM")
+    return llm, llm_type
+
+
+def _try_load_json(file_path: str) -> Tuple[str, Any, Optional[Exception]]:
+    """Load one JSON file, returning the error instead of raising so a pool can map over files"""
+    try:
+        return file_path, load_json(file_path), None
+    except (OSError, ValueError) as e:  # unreadable file or malformed JSON
+        return file_path, None, e
+
+
+# Row labels of the markdown scoring table, in display order
+SCORE_LABELS = (
+    ('growth_potential', 'Growth Potential'),
+    ('financial_stability', 'Financial Stability'),
+    ('leadership_quality', 'Leadership Quality'),
+    ('innovation_capacity', 'Innovation Capacity'),
+    ('market_sentiment', 'Market Sentiment'),
+)
+
+
+def _score_rating(key: str, score: float) -> str:
+    """Rating label shown next to a score in the markdown report"""
+    if key == 'market_sentiment':
+        return 'Positive' if score >= 6 else 'Neutral' if score >= 4 else 'Negative'
+    return 'Excellent' if score >= 8 else 'Good' if score >= 6 else 'Moderate'
+
+
+def _bucket_score(score: float) -> float:
+    """Round a 0-10 score to the nearest 0.5 so small jitter yields the same prompt"""
+    return round(score * 2) / 2
+
+
+@dataclass(slots=True)
+class InvestmentMetrics:
+    """Investment metrics derived from a ticker's analysis data (scores are 0-10)"""
+    growth_potential: float = 0
+    financial_stability: float = 0
+    leadership_quality: float = 0
+    innovation_capacity: float = 0
+    market_sentiment: float = 0
+    risk_factors: List[str] = field(default_factory=list)
+    opportunity_factors: List[str] = field(default_factory=list)
+    time_horizon_suitability: Dict[str, str] = field(default_factory=dict)
+    investment_style_fit: Dict[str, str] = field(default_factory=dict)
 
 
 class InvestmentRecommenderAgent:
@@ -18,109 +146,80 @@ class InvestmentRecommenderAgent:
         """
         self.use_llm = use_llm
         
-        # Initialize LLM based on preference
-        if use_llm == "gemini":
-            try:
-                self.llm = get_gemini_model()
-                self.llm_type = "gemini"
-            except ValueError:
-                self.llm = get_openai_model()
-                self.llm_type = "openai"
-        else:
-            try:
-                self.llm = get_openai_model()
-                self.llm_type = "openai"
-            except ValueError:
-                self.llm = get_gemini_model()
-                self.llm_type = "gemini"
-        
-        print(f"✅ Investment Recommender Agent initialized with {self.llm_type.upper()} LLM")
+        # LLM clients are shared by every agent in the process
+        self.llm, self.llm_type = _get_llm(use_llm)
     
     def load_ticker_analysis(self, ticker: str) -> Dict[str, Any]:
         """Load the latest analysis results for a ticker"""
+        reports_dir = os.path.join("reports", ticker.upper(), "raw_data")
+        
+        if not os.path.isdir(reports_dir):
+            return {'error': f"No analysis data found for {ticker}"}
+        
+        # Find the latest analysis files in a single directory scan (path -> stem)
         try:
-            reports_dir = Path(f"reports/{ticker.upper()}/raw_data")
-            
-            if not reports_dir.exists():
-                return {'error': f"No analysis data found for {ticker}"}
-            
-            # Find the latest analysis files
-            analysis_files = list(reports_dir.glob("*.json"))
-            if not analysis_files:
-                return {'error': f"No analysis files found for {ticker}"}
-            
-            # Load all analysis data
-            analysis_data = {
-                'ticker': ticker.upper(),
-                'loaded_files': []
-            }
-            
-            for file_path in analysis_files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    # Determine analysis type from filename
-                    filename = file_path.stem
-                    if 'cash_flow' in filename or 'financial' in filename:
-                        analysis_data['financial_analysis'] = data
-                    elif 'ceo' in filename or 'leadership' in filename:
-                        analysis_data['ceo_analysis'] = data
-                    elif 'technology' in filename:
-                        analysis_data['technology_analysis'] = data
-                    elif 'sentiment' in filename:
-                        analysis_data['sentiment_analysis'] = data
-                    elif 'profit' in filename:
-                        analysis_data['profit_analysis'] = data
-                    
-                    analysis_data['loaded_files'].append(str(file_path))
-                    
-                except Exception as e:
-                    print(f"Error loading {file_path}: {e}")
+            with os.scandir(reports_dir) as entries:
+                analysis_files = {entry.path: entry.name[:-len('.json')] for entry in entries
+                                  if entry.name.endswith('.json') and entry.is_file()}
+        except OSError as e:
+            return {'error': f"Failed to load analysis for {ticker}: {str(e)}"}
+        if not analysis_files:
+            return {'error': f"No analysis files found for {ticker}"}
+        
+        # Load all analysis data
+        analysis_data = {
+            'ticker': ticker.upper(),
+            'loaded_files': []
+        }
+        
+        # Overlap the file reads, then classify on this thread
+        with ThreadPoolExecutor(max_workers=min(8, len(analysis_files))) as executor:
+            loaded = list(executor.map(_try_load_json, analysis_files))
+        
+        for file_path, data, error in loaded:
+            if error is not None:
+                print(f"Error loading {file_path}: {error}")
+                continue
             
-            return analysis_data
+            # Determine analysis type from filename
+            match = ANALYSIS_FILE_PATTERN.search(analysis_files[file_path])
+            if match:
+                analysis_data[ANALYSIS_FILE_MARKERS[match.group(0)]] = data
             
-        except Exception as e:
-            return {'error': f"Failed to load analysis for {ticker}: {str(e)}"}
+            analysis_data['loaded_files'].append(file_path)
+        
+        return analysis_data
     
-    def calculate_investment_metrics(self, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+    def calculate_investment_metrics(self, analysis_data: Dict[str, Any]) -> InvestmentMetrics:
         """Calculate detailed investment metrics from analysis data"""
-        metrics = {
-            'growth_potential': 0,
-            'financial_stability': 0,
-            'leadership_quality': 0,
-            'innovation_capacity': 0,
-            'market_sentiment': 0,
-            'risk_factors': [],
-            'opportunity_factors': [],
-            'time_horizon_suitability': {},
-            'investment_style_fit': {}
-        }
+        metrics = InvestmentMetrics()
+        
+        # Bind each analysis summary once instead of re-walking the nested dicts
+        fin_sum = analysis_data.get('financial_analysis', {}).get('analysis_summary')
+        tech_sum = analysis_data.get('technology_analysis', {}).get('analysis_summary')
+        ceo_sum = analysis_data.get('ceo_analysis', {}).get('analysis_summary')
+        sent_sum = analysis_data.get('sentiment_analysis', {}).get('analysis_summary')
+        prof_metrics = analysis_data.get('profit_analysis', {}).get('company_metrics')
         
         # Growth Potential (based on R&D, revenue trends, technology)
         growth_score = 0
         
         # From financial analysis
-        financial_data = analysis_data.get('financial_analysis', {})
-        if 'analysis_summary' in financial_data:
-            future_focus = financial_data['analysis_summary'].get('future_focus_score', 0)
-            growth_score += future_focus * 0.4
+        if fin_sum is not None:
+            growth_score += fin_sum.get('future_focus_score', 0) * 0.4
         
         # From technology analysis
-        tech_data = analysis_data.get('technology_analysis', {})
-        if 'analysis_summary' in tech_data:
-            tech_score = tech_data['analysis_summary'].get('overall_tech_score', 0)
-            growth_score += tech_score * 0.6
+        if tech_sum is not None:
+            growth_score += tech_sum.get('overall_tech_score', 0) * 0.6
         
-        metrics['growth_potential'] = min(growth_score, 10)
+        metrics.growth_potential = min(growth_score, 10)
         
         # Financial Stability
         stability_score = 5  # baseline
         
-        profit_data = analysis_data.get('profit_analysis', {})
-        if 'company_metrics' in profit_data:
-            roe = profit_data['company_metrics'].get('roe')
-            profit_margins = profit_data['company_metrics'].get('profit_margins_current', {})
+        if prof_metrics is not None:
+            roe = prof_metrics.get('roe')
+            profit_margins = prof_metrics.get('profit_margins_current', {})
             
             if roe and roe > 0.15:
                 stability_score += 2
@@ -133,125 +232,116 @@ class InvestmentRecommenderAgent:
             elif profit_margin and profit_margin < 0.02:
                 stability_score -= 1
         
-        metrics['financial_stability'] = max(min(stability_score, 10), 0)
+        metrics.financial_stability = max(min(stability_score, 10), 0)
         
         # Leadership Quality
-        ceo_data = analysis_data.get('ceo_analysis', {})
-        if 'analysis_summary' in ceo_data:
-            leadership_score = ceo_data['analysis_summary'].get('future_impact_score', 0)
-            metrics['leadership_quality'] = leadership_score
+        if ceo_sum is not None:
+            metrics.leadership_quality = ceo_sum.get('future_impact_score', 0)
         
         # Innovation Capacity
-        metrics['innovation_capacity'] = metrics['growth_potential']  # Same as growth for now
+        metrics.innovation_capacity = metrics.growth_potential  # Same as growth for now
         
         # Market Sentiment
-        sentiment_data = analysis_data.get('sentiment_analysis', {})
-        if 'analysis_summary' in sentiment_data:
-            sentiment_score = sentiment_data['analysis_summary'].get('overall_sentiment_score', 0)
+        if sent_sum is not None:
+            sentiment_score = sent_sum.get('overall_sentiment_score', 0)
             # Convert from -1 to 1 range to 0-10 range
-            metrics['market_sentiment'] = (sentiment_score + 1) * 5
-        
-        # Risk Factors Analysis
-        if metrics['financial_stability'] < 5:
-            metrics['risk_factors'].append("Low financial stability indicators")
-        
-        if metrics['leadership_quality'] < 5:
-            metrics['risk_factors'].append("Questionable leadership effectiveness")
+            metrics.market_sentiment = (sentiment_score + 1) * 5
         
-        if metrics['market_sentiment'] < 4:
-            metrics['risk_factors'].append("Negative market sentiment")
-        
-        if tech_data.get('analysis_summary', {}).get('potential_risks'):
-            metrics['risk_factors'].extend(tech_data['analysis_summary']['potential_risks'][:2])
+        # Risk Factors Analysis (merged in order, duplicates across sources dropped)
+        base_risks = (risk for flagged, risk in (
+            (metrics.financial_stability < 5, "Low financial stability indicators"),
+            (metrics.leadership_quality < 5, "Questionable leadership effectiveness"),
+            (metrics.market_sentiment < 4, "Negative market sentiment"),
+        ) if flagged)
+        tech_risks = (tech_sum.get('potential_risks') or [])[:2] if tech_sum else ()
+        metrics.risk_factors = list(dict.fromkeys(itertools.chain(base_risks, tech_risks)))
         
         # Opportunity Factors
-        if metrics['growth_potential'] > 7:
-            metrics['opportunity_factors'].append("Strong growth potential")
-        
-        if metrics['innovation_capacity'] > 7:
-            metrics['opportunity_factors'].append("High innovation capacity")
-        
-        if metrics['market_sentiment'] > 6:
-            metrics['opportunity_factors'].append("Positive market sentiment")
-        
-        if tech_data.get('analysis_summary', {}).get('key_strengths'):
-            metrics['opportunity_factors'].extend(tech_data['analysis_summary']['key_strengths'][:2])
+        base_opportunities = (opportunity for flagged, opportunity in (
+            (metrics.growth_potential > 7, "Strong growth potential"),
+            (metrics.innovation_capacity > 7, "High innovation capacity"),
+            (metrics.market_sentiment > 6, "Positive market sentiment"),
+        ) if flagged)
+        tech_strengths = (tech_sum.get('key_strengths') or [])[:2] if tech_sum else ()
+        metrics.opportunity_factors = list(dict.fromkeys(itertools.chain(base_opportunities, tech_strengths)))
         
         # Time Horizon Suitability
-        avg_score = (metrics['growth_potential'] + metrics['financial_stability'] + 
-                    metrics['leadership_quality'] + metrics['innovation_capacity']) / 4
+        avg_score = (metrics.growth_potential + metrics.financial_stability + 
+                    metrics.leadership_quality + metrics.innovation_capacity) / 4
         
-        if metrics['growth_potential'] > 7 and metrics['innovation_capacity'] > 7:
-            metrics['time_horizon_suitability']['long_term'] = 'excellent'
-            metrics['time_horizon_suitability']['medium_term'] = 'good'
-            metrics['time_horizon_suitability']['short_term'] = 'moderate'
+        if metrics.growth_potential > 7 and metrics.innovation_capacity > 7:
+            metrics.time_horizon_suitability['long_term'] = 'excellent'
+            metrics.time_horizon_suitability['medium_term'] = 'good'
+            metrics.time_horizon_suitability['short_term'] = 'moderate'
         elif avg_score > 6:
-            metrics['time_horizon_suitability']['long_term'] = 'good'
-            metrics['time_horizon_suitability']['medium_term'] = 'good'
-            metrics['time_horizon_suitability']['short_term'] = 'moderate'
+            metrics.time_horizon_suitability['long_term'] = 'good'
+            metrics.time_horizon_suitability['medium_term'] = 'good'
+            metrics.time_horizon_suitability['short_term'] = 'moderate'
         else:
-            metrics['time_horizon_suitability']['long_term'] = 'moderate'
-            metrics['time_horizon_suitability']['medium_term'] = 'moderate'
-            metrics['time_horizon_suitability']['short_term'] = 'poor'
+            metrics.time_horizon_suitability['long_term'] = 'moderate'
+            metrics.time_horizon_suitability['medium_term'] = 'moderate'
+            metrics.time_horizon_suitability['short_term'] = 'poor'
         
         # Investment Style Fit
-        if metrics['growth_potential'] > 7:
-            metrics['investment_style_fit']['growth'] = 'excellent'
-        elif metrics['growth_potential'] > 5:
-            metrics['investment_style_fit']['growth'] = 'good'
+        if metrics.growth_potential > 7:
+            metrics.investment_style_fit['growth'] = 'excellent'
+        elif metrics.growth_potential > 5:
+            metrics.investment_style_fit['growth'] = 'good'
         else:
-            metrics['investment_style_fit']['growth'] = 'poor'
+            metrics.investment_style_fit['growth'] = 'poor'
         
-        if metrics['financial_stability'] > 7 and metrics['market_sentiment'] > 5:
-            metrics['investment_style_fit']['value'] = 'good'
+        if metrics.financial_stability > 7 and metrics.market_sentiment > 5:
+            metrics.investment_style_fit['value'] = 'good'
         else:
-            metrics['investment_style_fit']['value'] = 'moderate'
+            metrics.investment_style_fit['value'] = 'moderate'
         
-        if metrics['innovation_capacity'] > 8:
-            metrics['investment_style_fit']['innovation'] = 'excellent'
-        elif metrics['innovation_capacity'] > 6:
-            metrics['investment_style_fit']['innovation'] = 'good'
+        if metrics.innovation_capacity > 8:
+            metrics.investment_style_fit['innovation'] = 'excellent'
+        elif metrics.innovation_capacity > 6:
+            metrics.investment_style_fit['innovation'] = 'good'
         else:
-            metrics['investment_style_fit']['innovation'] = 'moderate'
+            metrics.investment_style_fit['innovation'] = 'moderate'
         
         return metrics
     
-    def generate_recommendation(self, ticker: str, investment_metrics: Dict[str, Any], analysis_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate comprehensive investment recommendation"""
-        
+    def score_recommendation(self, investment_metrics: InvestmentMetrics) -> Tuple[float, str, str]:
+        """Return (overall_score, recommendation, confidence) for a set of investment metrics"""
         # Calculate overall investment score
-        weights = {
-            'growth_potential': 0.25,
-            'financial_stability': 0.25,
-            'leadership_quality': 0.15,
-            'innovation_capacity': 0.20,
-            'market_sentiment': 0.15
-        }
+        overall_score = float((np.fromiter((getattr(investment_metrics, key) for key in METRIC_KEYS), dtype=float) * METRIC_WEIGHTS).sum())
         
-        overall_score = sum(
-            investment_metrics[key] * weight 
-            for key, weight in weights.items()
-        )
+        # Determine recommendation category (a score equal to a threshold falls in the bucket above it)
+        recommendation, confidence = RECOMMENDATION_CATEGORIES[bisect.bisect_right(RECOMMENDATION_THRESHOLDS, overall_score)]
         
-        # Determine recommendation category
-        if overall_score >= 8:
-            recommendation = "STRONG BUY"
-            confidence = "High"
-        elif overall_score >= 6.5:
-            recommendation = "BUY"
-            confidence = "Medium-High"
-        elif overall_score >= 5:
-            recommendation = "HOLD"
-            confidence = "Medium"
-        elif overall_score >= 3.5:
-            recommendation = "WEAK HOLD"
-            confidence = "Medium-Low"
-        else:
-            recommendation = "SELL"
-            confidence = "High"
+        return overall_score, recommendation, confidence
+    
+    def score_recommendations(self, metrics_list: List[InvestmentMetrics]) -> List[Tuple[float, str, str]]:
+        """Score many tickers at once, same results as score_recommendation for each"""
+        if not metrics_list:
+            return []
+        
+        # One (N, K) weighted row sum instead of a Python-level loop per ticker; multiply-then-sum
+        # (rather than a BLAS matmul) keeps scores bit-identical to the single-ticker path
+        matrix = np.array([[getattr(metrics, key) for key in METRIC_KEYS] for metrics in metrics_list], dtype=float)
+        overall_scores = (matrix * METRIC_WEIGHTS).sum(axis=1)
+        buckets = np.searchsorted(RECOMMENDATION_THRESHOLDS, overall_scores, side='right')
+        
+        return [(float(score), *RECOMMENDATION_CATEGORIES[bucket]) for score, bucket in zip(overall_scores, buckets)]
+    
+    def generate_recommendation(self, ticker: str, investment_metrics: InvestmentMetrics, analysis_data: Dict[str, Any],
+                                on_token: Optional[Callable[[str], None]] = None, reasoning: Optional[str] = None,
+                                now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Generate comprehensive investment recommendation
+        
+        Pass reasoning to reuse text that was already generated (e.g. by a
+        batched request) instead of asking the LLM again, and now to stamp
+        the recommendation with the same time as its saved files.
+        """
+        now = now or datetime.now()
+        overall_score, recommendation, confidence = self.score_recommendation(investment_metrics)
         
         # Generate LLM-powered detailed reasoning
-        reasoning = self.generate_llm_reasoning(ticker, investment_metrics, analysis_data, recommendation)
+        if reasoning is None:
+            reasoning = self.generate_llm_reasoning(ticker, investment_metrics, analysis_data, recommendation, on_token=on_token)
         
         recommendation_result = {
             'ticker': ticker,
@@ -259,101 +349,239 @@ class InvestmentRecommenderAgent:
             'overall_score': round(overall_score, 2),
             'confidence_level': confidence,
             'detailed_scores': {
-                'growth_potential': investment_metrics['growth_potential'],
-                'financial_stability': investment_metrics['financial_stability'],
-                'leadership_quality': investment_metrics['leadership_quality'],
-                'innovation_capacity': investment_metrics['innovation_capacity'],
-                'market_sentiment': investment_metrics['market_sentiment']
+                'growth_potential': investment_metrics.growth_potential,
+                'financial_stability': investment_metrics.financial_stability,
+                'leadership_quality': investment_metrics.leadership_quality,
+                'innovation_capacity': investment_metrics.innovation_capacity,
+                'market_sentiment': investment_metrics.market_sentiment
             },
-            'time_horizon_recommendations': investment_metrics['time_horizon_suitability'],
-            'investment_style_fit': investment_metrics['investment_style_fit'],
-            'key_risks': investment_metrics['risk_factors'][:5],
-            'key_opportunities': investment_metrics['opportunity_factors'][:5],
+            'time_horizon_recommendations': investment_metrics.time_horizon_suitability,
+            'investment_style_fit': investment_metrics.investment_style_fit,
+            'key_risks': investment_metrics.risk_factors,
+            'key_opportunities': investment_metrics.opportunity_factors,
             'llm_reasoning': reasoning,
-            'recommendation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'recommendation_date': now.isoformat(sep=' ', timespec='seconds'),
             'analyst': f"AI Investment Recommender ({self.llm_type.upper()})"
         }
         
         return recommendation_result
     
-    def generate_llm_reasoning(self, ticker: str, metrics: Dict[str, Any], analysis_data: Dict[str, Any], recommendation: str) -> str:
-        """Generate detailed reasoning using LLM"""
+    def generate_llm_reasoning(self, ticker: str, metrics: InvestmentMetrics, analysis_data: Dict[str, Any], recommendation: str,
+                               on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Generate detailed reasoning using LLM
+        
+        When on_token is given the response is streamed and each text chunk is
+        passed to it as soon as it arrives. Everything returned goes through
+        on_token, including the fallback message of a failed request and the
+        marker appended when a stream breaks off part way.
+        """
         try:
-            prompt = f"""
-            As an expert financial analyst, provide detailed reasoning for the {recommendation} recommendation for {ticker}.
+            prompt = self._build_reasoning_prompt(ticker, metrics, recommendation)
+            cache_prompt = f"{REASONING_INSTRUCTIONS}\n\n{prompt}"
+            cached = llm_response_cache.get(self.llm_type, cache_prompt)
+            if cached is not None:
+                print("   [CACHE] Reusing cached LLM reasoning")
+                if on_token is not None:
+                    on_token(cached)
+                return cached
             
-            Consider these key metrics:
-            - Growth Potential: {metrics['growth_potential']}/10
-            - Financial Stability: {metrics['financial_stability']}/10
-            - Leadership Quality: {metrics['leadership_quality']}/10
-            - Innovation Capacity: {metrics['innovation_capacity']}/10
-            - Market Sentiment: {metrics['market_sentiment']}/10
-            
-            Key Risks: {', '.join(metrics['risk_factors'][:3])}
-            Key Opportunities: {', '.join(metrics['opportunity_factors'][:3])}
-            
-            Provide a comprehensive analysis covering:
-            1. Primary reasons supporting this recommendation
-            2. Key risk factors to monitor
-            3. Catalysts that could change the outlook
-            4. Ideal holding period and investment approach
-            
-            Keep the analysis professional, specific, and actionable. Limit to 400 words.
-            """
-            
-            if self.llm_type == "gemini":
-                response = self.llm.generate_content(prompt)
-                return response.text
+            if on_token is not None:
+                chunks = []
+                stream = self._stream_llm(prompt)
+                while True:
+                    try:
+                        chunk = next(stream)
+                    except StopIteration:
+                        break
+                    except Exception as e:
+                        if not chunks:
+                            raise
+                        # Keep the text that already reached the reader and mark where it stopped
+                        marker = f"\n\n[stream interrupted: {str(e)}]"
+                        on_token(marker)
+                        return "".join(chunks) + marker
+                    chunks.append(chunk)
+                    on_token(chunk)
+                reasoning = "".join(chunks)
+            elif self.llm_type == "gemini":
+                response = self.llm.generate_content([REASONING_INSTRUCTIONS, prompt])
+                reasoning = response.text
             else:  # OpenAI
                 response = self.llm.chat.completions.create(
                     model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": "You are an expert financial analyst providing investment recommendations."},
-                        {"role": "user", "content": prompt}
-                    ],
+                    messages=self._reasoning_messages(prompt),
                     max_tokens=600
                 )
-                return response.choices[0].message.content
+                reasoning = response.choices[0].message.content
+            
+            llm_response_cache.set(self.llm_type, cache_prompt, reasoning)
+            return reasoning
                 
         except Exception as e:
-            return f"Detailed reasoning generation failed: {str(e)}. Based on the quantitative analysis, this {recommendation} recommendation is supported by the overall score and individual metric assessments."
+            fallback = f"Detailed reasoning generation failed: {str(e)}. Based on the quantitative analysis, this {recommendation} recommendation is supported by the overall score and individual metric assessments."
+            if on_token is not None:
+                on_token(fallback)
+            return fallback
+    
+    def _build_reasoning_prompt(self, ticker: str, metrics: InvestmentMetrics, recommendation: str) -> str:
+        """Build the per-ticker part of the reasoning prompt"""
+        return REASONING_PROMPT_TEMPLATE.format(
+            recommendation=recommendation,
+            ticker=ticker,
+            **{key: _bucket_score(getattr(metrics, key)) for key in METRIC_KEYS},
+            risks=', '.join(sorted(metrics.risk_factors[:3])),
+            opportunities=', '.join(sorted(metrics.opportunity_factors[:3]))
+        )
+    
+    def _batched_reasoning(self, prompts: List[str]) -> List[str]:
+        """Generate reasoning for several tickers with a single LLM round-trip"""
+        tasks = "\n\n".join(f"### Task {i}\n{prompt}" for i, prompt in enumerate(prompts))
+        batched_prompt = (
+            f"Answer each of the {len(prompts)} tasks below independently.\n"
+            f'Respond with a JSON object of the form {{"responses": [...]}} where responses[i] '
+            f"is the plain-text reasoning for Task i.\n\n{tasks}"
+        )
+        
+        if self.llm_type == "gemini":
+            response = self.llm.generate_content(
+                [REASONING_INSTRUCTIONS, batched_prompt],
+                generation_config={"response_mime_type": "application/json"}
+            )
+            text = response.text
+        else:  # OpenAI
+            response = self.llm.chat.completions.create(
+                model="gpt-4o",
+                messages=self._reasoning_messages(batched_prompt),
+                response_format={"type": "json_object"},
+                max_tokens=600 * len(prompts)
+            )
+            text = response.choices[0].message.content
+        
+        responses = json.loads(text).get('responses')
+        if not isinstance(responses, list) or len(responses) != len(prompts):
+            raise ValueError(f"expected {len(prompts)} responses in batched reply")
+        return [str(response) for response in responses]
+    
+    def _reasoning_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """OpenAI messages with the static instructions first and the ticker details last"""
+        return [
+            {"role": "system", "content": REASONING_INSTRUCTIONS},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _stream_llm(self, prompt: str):
+        """Yield response text chunks from the configured LLM as they are generated"""
+        if self.llm_type == "gemini":
+            for chunk in self.llm.generate_content([REASONING_INSTRUCTIONS, prompt], stream=True):
+                if chunk.text:
+                    yield chunk.text
+        else:  # OpenAI
+            stream = self.llm.chat.completions.create(
+                model="gpt-4o",
+                messages=self._reasoning_messages(prompt),
+                max_tokens=600,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
     
-    def save_recommendation(self, ticker: str, recommendation: Dict[str, Any]) -> str:
+    def save_recommendation(self, ticker: str, recommendation: Dict[str, Any], now: Optional[datetime] = None) -> str:
         """Save recommendation to ticker folder"""
+        now = now or datetime.now()
         try:
-            reports_dir = Path(f"reports/{ticker.upper()}")
-            reports_dir.mkdir(exist_ok=True)
+            filepath, md_filepath = self._report_paths(ticker, now)
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"investment_recommendation_{timestamp}.json"
-            filepath = reports_dir / filename
+            # Serialize both artifacts up front, then write them concurrently
+            json_bytes = dumps_json(recommendation)
+            md_bytes = self.create_recommendation_markdown(recommendation).encode('utf-8')
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(recommendation, f, indent=2, default=str)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                writes = [
+                    executor.submit(filepath.write_bytes, json_bytes),
+                    executor.submit(md_filepath.write_bytes, md_bytes)
+                ]
+                for write in writes:
+                    write.result()
             
-            # Also create a markdown summary
-            md_filename = f"investment_recommendation_{timestamp}.md"
-            md_filepath = reports_dir / md_filename
+            return str(md_filepath)
             
-            md_content = self.create_recommendation_markdown(recommendation)
+        except OSError as e:
+            return f"Failed to save recommendation: {str(e)}"
+    
+    def save_streamed_recommendation(self, ticker: str, recommendation: Dict[str, Any], investment_metrics: InvestmentMetrics,
+                                     analysis_data: Dict[str, Any], on_token: Optional[Callable[[str], None]] = None,
+                                     now: Optional[datetime] = None) -> str:
+        """Save a recommendation while its LLM reasoning streams into the report
+        
+        The markdown header and tables are written before the first token, the
+        reasoning is appended under Detailed Analysis chunk by chunk and the
+        footer follows once it completes. recommendation['llm_reasoning'] is
+        filled in place with the same text (including any failure message or
+        interruption marker) and the JSON is written last.
+        """
+        now = now or datetime.now()
+        try:
+            filepath, md_filepath = self._report_paths(ticker, now)
+            head, tail = self._markdown_sections(recommendation)
             
-            with open(md_filepath, 'w', encoding='utf-8') as f:
-                f.write(md_content)
+            with open(md_filepath, 'w', encoding='utf-8') as md_file:
+                md_file.write(head)
+                md_file.flush()
+                
+                def _write_chunk(chunk: str):
+                    md_file.write(chunk)
+                    md_file.flush()
+                    if on_token is not None:
+                        on_token(chunk)
+                
+                reasoning = self.generate_llm_reasoning(ticker, investment_metrics, analysis_data,
+                                                        recommendation['recommendation'], on_token=_write_chunk)
+                md_file.write(tail)
             
+            recommendation['llm_reasoning'] = reasoning
+            filepath.write_bytes(dumps_json(recommendation))
             return str(md_filepath)
             
-        except Exception as e:
+        except OSError as e:
+            if not recommendation['llm_reasoning']:
+                recommendation['llm_reasoning'] = self.generate_llm_reasoning(
+                    ticker, investment_metrics, analysis_data, recommendation['recommendation'], on_token=on_token)
             return f"Failed to save recommendation: {str(e)}"
     
+    def _report_paths(self, ticker: str, now: datetime) -> Tuple[Path, Path]:
+        """Return the (json, markdown) paths for a recommendation made at now"""
+        reports_dir = Path(f"reports/{ticker.upper()}")
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        
+        timestamp = f"{now:%Y%m%d_%H%M%S}"
+        return (reports_dir / f"investment_recommendation_{timestamp}.json",
+                reports_dir / f"investment_recommendation_{timestamp}.md")
+    
     def create_recommendation_markdown(self, recommendation: Dict[str, Any]) -> str:
         """Create markdown report for recommendation"""
+        head, tail = self._markdown_sections(recommendation)
+        return f"{head}{recommendation['llm_reasoning']}{tail}"
+    
+    def _markdown_sections(self, recommendation: Dict[str, Any]) -> Tuple[str, str]:
+        """Return the report markdown before and after the Detailed Analysis text"""
         
         ticker = recommendation['ticker']
         rec = recommendation['recommendation']
         score = recommendation['overall_score']
         confidence = recommendation['confidence_level']
+        scores = recommendation['detailed_scores']
+        horizon = recommendation['time_horizon_recommendations']
+        style_fit = recommendation['investment_style_fit']
+        
+        score_rows = "\n".join(
+            f"| {label} | {scores[key]}/10 | {_score_rating(key, scores[key])} |"
+            for key, label in SCORE_LABELS
+        )
+        opportunities = "\n".join(f"- {opportunity}" for opportunity in recommendation['key_opportunities'])
+        risks = "\n".join(f"- {risk}" for risk in recommendation['key_risks'])
         
-        content = f"""# Investment Recommendation: {ticker}
+        head = f"""# Investment Recommendation: {ticker}
 
 **Recommendation:** {rec}  
 **Overall Score:** {score}/10  
@@ -373,45 +601,42 @@ Based on comprehensive analysis across five key dimensions, {ticker} receives a
 
 | Metric | Score | Rating |
 |--------|-------|--------|
-| Growth Potential | {recommendation['detailed_scores']['growth_potential']}/10 | {'Excellent' if recommendation['detailed_scores']['growth_potential'] >= 8 else 'Good' if recommendation['detailed_scores']['growth_potential'] >= 6 else 'Moderate'} |
-| Financial Stability | {recommendation['detailed_scores']['financial_stability']}/10 | {'Excellent' if recommendation['detailed_scores']['financial_stability'] >= 8 else 'Good' if recommendation['detailed_scores']['financial_stability'] >= 6 else 'Moderate'} |
-| Leadership Quality | {recommendation['detailed_scores']['leadership_quality']}/10 | {'Excellent' if recommendation['detailed_scores']['leadership_quality'] >= 8 else 'Good' if recommendation['detailed_scores']['leadership_quality'] >= 6 else 'Moderate'} |
-| Innovation Capacity | {recommendation['detailed_scores']['innovation_capacity']}/10 | {'Excellent' if recommendation['detailed_scores']['innovation_capacity'] >= 8 else 'Good' if recommendation['detailed_scores']['innovation_capacity'] >= 6 else 'Moderate'} |
-| Market Sentiment | {recommendation['detailed_scores']['market_sentiment']}/10 | {'Positive' if recommendation['detailed_scores']['market_sentiment'] >= 6 else 'Neutral' if recommendation['detailed_scores']['market_sentiment'] >= 4 else 'Negative'} |
+{score_rows}
 
 ---
 
 ## Investment Horizon Recommendations
 
-- **Long-term (3+ years):** {recommendation['time_horizon_recommendations'].get('long_term', 'N/A').title()}
-- **Medium-term (1-3 years):** {recommendation['time_horizon_recommendations'].get('medium_term', 'N/A').title()}
-- **Short-term (<1 year):** {recommendation['time_horizon_recommendations'].get('short_term', 'N/A').title()}
+- **Long-term (3+ years):** {horizon.get('long_term', 'N/A').title()}
+- **Medium-term (1-3 years):** {horizon.get('medium_term', 'N/A').title()}
+- **Short-term (<1 year):** {horizon.get('short_term', 'N/A').title()}
 
 ---
 
 ## Investment Style Fit
 
-- **Growth Investing:** {recommendation['investment_style_fit'].get('growth', 'N/A').title()}
-- **Value Investing:** {recommendation['investment_style_fit'].get('value', 'N/A').title()}
-- **Innovation Focus:** {recommendation['investment_style_fit'].get('innovation', 'N/A').title()}
+- **Growth Investing:** {style_fit.get('growth', 'N/A').title()}
+- **Value Investing:** {style_fit.get('value', 'N/A').title()}
+- **Innovation Focus:** {style_fit.get('innovation', 'N/A').title()}
 
 ---
 
 ## Key Opportunities
 
-{chr(10).join(f"- {opportunity}" for opportunity in recommendation['key_opportunities'])}
+{opportunities}
 
 ---
 
 ## Key Risks
 
-{chr(10).join(f"- {risk}" for risk in recommendation['key_risks'])}
+{risks}
 
 ---
 
 ## Detailed Analysis
 
-{recommendation['llm_reasoning']}
+"""
+        tail = """
 
 ---
 
@@ -423,11 +648,15 @@ This analysis is generated by an AI system for informational purposes only and s
 
 *Report generated by AI Investment Recommender Agent*
 """
-        
-        return content
+        return head, tail
     
-    def recommend_investment(self, ticker: str) -> Dict[str, Any]:
-        """Main method to generate investment recommendation for a ticker"""
+    def recommend_investment(self, ticker: str, on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Main method to generate investment recommendation for a ticker
+        
+        Args:
+            ticker: Stock ticker symbol
+            on_token: Optional callback receiving the LLM reasoning as it streams
+        """
         
         print(f"\n💡 Generating investment recommendation for {ticker.upper()}")
         print("=" * 60)
@@ -448,12 +677,14 @@ This analysis is generated by an AI system for informational purposes only and s
         
         # Generate recommendation
         print("🎯 Generating recommendation...")
-        recommendation = self.generate_recommendation(ticker, investment_metrics, analysis_data)
+        now = datetime.now()
+        recommendation = self.generate_recommendation(ticker, investment_metrics, analysis_data, reasoning="", now=now)
         print(f"   ✅ Recommendation: {recommendation['recommendation']}")
         
-        # Save recommendation
+        # Save recommendation, streaming the LLM reasoning into the report as it arrives
         print("💾 Saving recommendation...")
-        report_path = self.save_recommendation(ticker, recommendation)
+        report_path = self.save_streamed_recommendation(ticker, recommendation, investment_metrics, analysis_data,
+                                                        on_token=on_token, now=now)
         recommendation['report_path'] = report_path
         print(f"   ✅ Recommendation saved: {report_path}")
         
@@ -466,16 +697,96 @@ This analysis is generated by an AI system for informational purposes only and s
         return recommendation
 
 
+    def recommend_investments(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Generate investment recommendations for several tickers
+        
+        Analyses are loaded and scored concurrently, and the reasoning for every
+        ticker not already in the response cache is requested in one batched
+        LLM call. Tickers without analysis data map to their error dict.
+        """
+        tickers = [ticker.upper() for ticker in tickers]
+        if not tickers:
+            return {}
+        
+        print(f"\n💡 Generating investment recommendations for {', '.join(tickers)}")
+        print("=" * 60)
+        
+        def _prepare(ticker: str) -> Tuple[Dict[str, Any], Optional[InvestmentMetrics]]:
+            analysis_data = self.load_ticker_analysis(ticker)
+            if 'error' in analysis_data:
+                return analysis_data, None
+            return analysis_data, self.calculate_investment_metrics(analysis_data)
+        
+        print("📁 Loading analysis data and calculating metrics...")
+        with ThreadPoolExecutor(max_workers=min(8, len(tickers))) as executor:
+            prepared = dict(zip(tickers, executor.map(_prepare, tickers)))
+        
+        # Reuse cached reasoning where possible, batch the rest
+        reasonings = {}
+        pending = {}
+        scorable = {ticker: metrics for ticker, (_, metrics) in prepared.items() if metrics is not None}
+        scored = self.score_recommendations(list(scorable.values()))
+        for (ticker, metrics), (_, recommendation, _) in zip(scorable.items(), scored):
+            prompt = self._build_reasoning_prompt(ticker, metrics, recommendation)
+            cache_prompt = f"{REASONING_INSTRUCTIONS}\n\n{prompt}"
+            cached = llm_response_cache.get(self.llm_type, cache_prompt)
+            if cached is not None:
+                reasonings[ticker] = cached
+            else:
+                pending[ticker] = (cache_prompt, prompt)
+        
+        if pending:
+            print(f"🎯 Generating reasoning for {len(pending)} ticker(s) in one request...")
+            try:
+                responses = self._batched_reasoning([prompt for _, prompt in pending.values()])
+                for (ticker, (cache_prompt, _)), reasoning in zip(pending.items(), responses):
+                    llm_response_cache.set(self.llm_type, cache_prompt, reasoning)
+                    reasonings[ticker] = reasoning
+            except Exception as e:
+                # Tickers left without reasoning fall back to one request each
+                print(f"   [WARN] Batched reasoning failed, generating per ticker: {e}")
+        
+        results = {}
+        now = datetime.now()
+        for ticker, (analysis_data, metrics) in prepared.items():
+            if metrics is None:
+                results[ticker] = analysis_data
+                continue
+            
+            recommendation = self.generate_recommendation(ticker, metrics, analysis_data, reasoning=reasonings.get(ticker), now=now)
+            recommendation['report_path'] = self.save_recommendation(ticker, recommendation, now=now)
+            print(f"   ✅ {ticker}: {recommendation['recommendation']} ({recommendation['overall_score']}/10)")
+            results[ticker] = recommendation
+        
+        return results
+
+
 # Convenience function
-def get_investment_recommendation(ticker: str, use_llm: str = "gemini") -> Dict[str, Any]:
+def get_investment_recommendation(ticker: str, use_llm: str = "gemini",
+                                  on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
     """Convenience function to get investment recommendation
     
     Args:
         ticker: Stock ticker symbol
         use_llm: "gemini" for Gemini Pro or "openai" for ChatGPT-4o
+        on_token: Optional callback receiving the LLM reasoning as it streams
     
     Returns:
         Investment recommendation results
     """
     agent = InvestmentRecommenderAgent(use_llm=use_llm)
-    return agent.recommend_investment(ticker)
\ No newline at end of file
+    return agent.recommend_investment(ticker, on_token=on_token)
+
+
+def get_investment_recommendations(tickers: List[str], use_llm: str = "gemini") -> Dict[str, Dict[str, Any]]:
+    """Convenience function to get recommendations for several tickers at once
+    
+    Args:
+        tickers: Stock ticker symbols
+        use_llm: "gemini" for Gemini Pro or "openai" for ChatGPT-4o
+    
+    Returns:
+        Investment recommendation results keyed by ticker
+    """
+    agent = InvestmentRecommenderAgent(use_llm=use_llm)
+    return agent.recommend_investments(tickers)
@@ -1,27 +1,158 @@
 import asyncio
-from typing import Dict, Any, Optional
+import json
+import logging
+import os
+import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Dict, Any, Optional, Tuple, List
 import time
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
 # Import analysis tools
 from src.tool.financial_analysis import CashFlowAnalyzer, ProfitAnalyzer
 from src.tool.ceo_analysis import CEOAnalyzer
 from src.tool.technology_analysis import TechnologyAnalyzer
 from src.tool.sentiment_analysis import SentimentAnalyzer
 from src.tool.report_generator import ReportGenerator
+from src.utils.analysis_cache import analysis_cache
+from src.utils.stage_cache import stage_cache
+from src.utils.json_utils import dumps_compact_json
+from src.utils.llm_rate import llm_rate_limiters
 
 # Import LLM configuration
-from src.config import default_llm, llm_type, get_gemini_model, get_openai_model
+from src.config import get_gemini_model, get_openai_model, get_openai_async_model
+
+logger = logging.getLogger(__name__)
 
 # Import RAG and workflow components
 from src.tool.RAG.vector_store import knowledge_store
 try:
-    from src.workflow.analysis_workflow import analysis_workflow
+    from src.workflow.analysis_workflow import TickerAnalysisWorkflow, LANGGRAPH_AVAILABLE
     from src.workflow.visualization import workflow_visualizer
     WORKFLOW_AVAILABLE = True
 except ImportError:
     WORKFLOW_AVAILABLE = False
-    print("[WARN] Workflow components not available")
+    logger.warning("[WARN] Workflow components not available")
+
+
+# Sub-scores feeding the overall investment score, and their weights
+SCORE_KEYS = ('future_focus_score', 'leadership_score', 'technology_score', 'financial_health_score', 'sentiment_score')
+SCORE_WEIGHTS = np.array([0.25, 0.2, 0.25, 0.2, 0.1])
+RISK_LEVELS = ('high', 'medium', 'low')
+
+
+def _dig(data: Any, *path: str, default: Any = None) -> Any:
+    """Follow a key path through nested dicts, returning default where it breaks off"""
+    try:
+        for key in path:
+            data = data[key]
+        return data
+    except (KeyError, TypeError):
+        return default
+
+
+def _failed_stages(analysis_status: Any) -> List[str]:
+    """Names of the stages an analysis_status dict marks as 'failed: ...'"""
+    if not isinstance(analysis_status, dict):
+        return []
+    return [stage for stage, status in analysis_status.items() if isinstance(status, str) and status.startswith('failed')]
+
+
+def _summary_score(section: str, field: str, scale=None):
+    """Build an extractor for a score in the analysis_summary of an analysis section"""
+    def extract(analysis_results: Dict[str, Any]) -> float:
+        summary = _dig(analysis_results, section, 'analysis_summary')
+        if summary is None:
+            return 0
+        value = summary.get(field, 0)
+        return scale(value) if scale else value
+    return extract
+
+
+def _financial_health_score(analysis_results: Dict[str, Any]) -> float:
+    """Simplified financial health: baseline 5, +2 for ROE above 15%, +2 for a margin above 10%"""
+    company_metrics = _dig(analysis_results, 'profit_analysis', 'company_metrics')
+    if company_metrics is None:
+        return 0
+    roe = company_metrics.get('roe')
+    profit_margin = _dig(company_metrics, 'profit_margins_current', 'profit_margin')
+    return min(5 + 2 * bool(roe and roe > 0.15) + 2 * bool(profit_margin and profit_margin > 0.1), 10)
+
+
+# One extractor per entry of SCORE_KEYS
+SCORE_EXTRACTORS = (
+    _summary_score('cash_flow_analysis', 'future_focus_score'),
+    _summary_score('ceo_analysis', 'future_impact_score'),
+    _summary_score('technology_analysis', 'overall_tech_score'),
+    _financial_health_score,
+    # Convert sentiment from the -1 to 1 range to 0-10
+    _summary_score('sentiment_analysis', 'overall_sentiment_score', scale=lambda raw: (raw + 1) * 5),
+)
+
+# Independent analysis stages: (status key, log tag, description, display name, analyzer attribute, method)
+ANALYSIS_STAGES = (
+    ('cash_flow', 'CASH_FLOW', 'cash flow analysis', 'Cash flow', 'cash_flow_analyzer', 'analyze_cash_flow'),
+    ('profit', 'PROFIT', 'profit mechanism analysis', 'Profit', 'profit_analyzer', 'analyze_profit_mechanisms'),
+    ('ceo', 'CEO', 'CEO & leadership analysis', 'CEO', 'ceo_analyzer', 'analyze_ceo_complete'),
+    ('technology', 'TECH', 'technology & IP analysis', 'Technology', 'technology_analyzer', 'analyze_technology_complete'),
+    ('sentiment', 'SENTIMENT', 'market sentiment analysis', 'Sentiment', 'sentiment_analyzer', 'analyze_sentiment_complete'),
+)
+
+# Parts of an analyzer result worth sending to the LLM; raw inputs such as company_info are left out
+PROMPT_FIELDS = (
+    'analysis_summary', 'company_metrics', 'rd_analysis', 'competitive_advantages', 'ceo_background',
+    'leadership_analysis', 'technology_scores', 'combined_sentiment'
+)
+PROMPT_DATA_LIMIT = 2000
+
+# Executive summary section of a generated report, up to the next horizontal rule
+EXEC_SUMMARY_PATTERN = re.compile(r'(## Executive Summary.*?)---', re.S)
+
+
+def _project_prompt_data(data: Any) -> Any:
+    """Keep only the PROMPT_FIELDS of an analyzer result"""
+    if not isinstance(data, dict):
+        return data
+    projected = {key: data[key] for key in PROMPT_FIELDS if key in data}
+    if projected:
+        return projected
+    # Wrappers such as {'cash_flow': ..., 'profit': ...} are projected per entry
+    return {key: _project_prompt_data(value) for key, value in data.items()}
+
+
+def _prompt_data(data: Dict[str, Any]) -> str:
+    """Render analysis data for a prompt as compact JSON, capped at PROMPT_DATA_LIMIT characters"""
+    return dumps_compact_json(_project_prompt_data(data))[:PROMPT_DATA_LIMIT]
+
+
+@dataclass(slots=True)
+class AnalysisResults:
+    """Skeleton of the results of one ticker analysis"""
+    ticker: str
+    analysis_timestamp: str
+    llm_used: str
+    company_info: Dict[str, Any] = field(default_factory=dict)
+    cash_flow_analysis: Dict[str, Any] = field(default_factory=dict)
+    profit_analysis: Dict[str, Any] = field(default_factory=dict)
+    ceo_analysis: Dict[str, Any] = field(default_factory=dict)
+    technology_analysis: Dict[str, Any] = field(default_factory=dict)
+    sentiment_analysis: Dict[str, Any] = field(default_factory=dict)
+    llm_insights: Dict[str, Any] = field(default_factory=dict)
+    overall_scores: Dict[str, Any] = field(default_factory=dict)
+    analysis_status: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict in field order (the format the workflow, reports and caches exchange)"""
+        return {f.name: getattr(self, f.name) for f in ANALYSIS_RESULT_FIELDS}
+
+
+ANALYSIS_RESULT_FIELDS = fields(AnalysisResults)
 
 
 class TickerAnalyzerAgent:
@@ -51,6 +182,18 @@ class TickerAnalyzerAgent:
                 self.llm = get_gemini_model()
                 self.llm_type = "gemini"
         
+        # Async OpenAI clients, one per event loop: their connection pool is bound to the
+        # loop, and every blocking call runs in a fresh asyncio.run loop (Gemini models
+        # serve both APIs)
+        self._async_llms = weakref.WeakKeyDictionary()
+        
+        # Process-wide cap on concurrent / per-minute requests to this provider
+        self.rate_limiter = llm_rate_limiters[self.llm_type]
+        
+        # Token usage of the insight calls of the current analysis
+        self.token_usage = {'input_tokens': 0, 'output_tokens': 0, 'llm_calls': 0}
+        self._usage_lock = threading.Lock()
+        
         # Initialize analysis tools
         self.cash_flow_analyzer = CashFlowAnalyzer()
         self.profit_analyzer = ProfitAnalyzer()
@@ -59,87 +202,262 @@ class TickerAnalyzerAgent:
         self.sentiment_analyzer = SentimentAnalyzer()
         self.report_generator = ReportGenerator()
         
+        # Report files are written in the background, see wait_for_reports()
+        self._report_executor = ThreadPoolExecutor(max_workers=2)
+        self._pending_reports = []
+        
+        # ticker -> (report path, mtime, executive summary) of the last summary served
+        self._summary_cache = {}
+        
         # RAG and workflow integration
         self.knowledge_store = knowledge_store
         if WORKFLOW_AVAILABLE:
-            self.workflow = analysis_workflow
+            self.workflow = TickerAnalysisWorkflow(self) if LANGGRAPH_AVAILABLE else None
             self.visualizer = workflow_visualizer
         else:
             self.workflow = None
             self.visualizer = None
         
-        print(f"[OK] Ticker Analyzer Agent initialized with {self.llm_type.upper()} LLM")
+        logger.info("[OK] Ticker Analyzer Agent initialized with %s LLM", self.llm_type.upper())
     
-    def get_llm_analysis(self, prompt: str, data: Dict[str, Any]) -> str:
-        """Get analysis from LLM based on data and prompt"""
+    def get_llm_analysis(self, prompt: str, data: Dict[str, Any], shared_prefix: str = "") -> str:
+        """Get analysis from LLM based on data and prompt
+        
+        shared_prefix is sent ahead of the prompt, byte-identical across calls,
+        so the provider can reuse its cached prefill for it.
+        """
         try:
+            with self.rate_limiter.limit_sync():
+                if self.llm_type == "gemini":
+                    response = self.llm.generate_content(f"{shared_prefix}{prompt}\n\nData: {_prompt_data(data)}")
+                    self._record_usage(response)
+                    return response.text
+                else:  # OpenAI
+                    response = self.llm.chat.completions.create(
+                        model="gpt-4o",
+                        messages=[
+                            {"role": "system", "content": self._system_prompt(shared_prefix)},
+                            {"role": "user", "content": f"{prompt}\n\nData: {_prompt_data(data)}"}
+                        ],
+                        max_tokens=500
+                    )
+                    self._record_usage(response)
+                    return response.choices[0].message.content
+        except Exception as e:
+            return f"LLM analysis failed: {str(e)}"
+    
+    async def get_llm_analysis_async(self, prompt: str, data: Dict[str, Any], shared_prefix: str = "") -> str:
+        """Async variant of get_llm_analysis that awaits the LLM instead of blocking"""
+        try:
+            async with self.rate_limiter.limit():
+                if self.llm_type == "gemini":
+                    response = await self.llm.generate_content_async(f"{shared_prefix}{prompt}\n\nData: {_prompt_data(data)}")
+                    self._record_usage(response)
+                    return response.text
+                else:  # OpenAI
+                    response = await self._async_llm().chat.completions.create(
+                        model="gpt-4o",
+                        messages=[
+                            {"role": "system", "content": self._system_prompt(shared_prefix)},
+                            {"role": "user", "content": f"{prompt}\n\nData: {_prompt_data(data)}"}
+                        ],
+                        max_tokens=500
+                    )
+                    self._record_usage(response)
+                    return response.choices[0].message.content
+        except Exception as e:
+            return f"LLM analysis failed: {str(e)}"
+    
+    def _record_usage(self, response):
+        """Add the token counts reported on an LLM response to the running totals"""
+        if self.llm_type == "gemini":
+            usage = getattr(response, 'usage_metadata', None)
+            input_tokens = getattr(usage, 'prompt_token_count', 0)
+            output_tokens = getattr(usage, 'candidates_token_count', 0)
+        else:  # OpenAI
+            usage = getattr(response, 'usage', None)
+            input_tokens = getattr(usage, 'prompt_tokens', 0)
+            output_tokens = getattr(usage, 'completion_tokens', 0)
+        
+        # Fallback insight calls may report from several threads at once
+        with self._usage_lock:
+            self.token_usage['input_tokens'] += input_tokens or 0
+            self.token_usage['output_tokens'] += output_tokens or 0
+            self.token_usage['llm_calls'] += 1
+    
+    def _system_prompt(self, shared_prefix: str = "") -> str:
+        """OpenAI system message, carrying the shared prefix so it leads every request"""
+        system_prompt = "You are a financial analysis expert."
+        return f"{system_prompt}\n\n{shared_prefix}" if shared_prefix else system_prompt
+    
+    def _build_shared_prefix(self, analysis_results: Dict[str, Any], investment_context: str = "") -> str:
+        """Build the context block common to every insight prompt for one ticker
+        
+        Kept deterministic (fixed field order, no timestamps) so repeated calls
+        produce an identical prefix that provider-side prompt caching can hit.
+        """
+        company_name = _dig(analysis_results, 'company_info', 'company_name', default='')
+        prefix = f"Ticker: {analysis_results.get('ticker', '')}\nCompany: {company_name}\n"
+        if investment_context:
+            prefix += f"Investment framework:\n{investment_context}\n"
+        return prefix + "\n"
+    
+    def _build_batched_prompt(self, prompts: List[str]) -> str:
+        """Combine several prompts into one request whose answers can be split apart again"""
+        tasks = "\n\n".join(f"### Task {i}\n{prompt}" for i, prompt in enumerate(prompts))
+        return (
+            f"Answer each of the {len(prompts)} tasks below independently.\n"
+            f'Respond with a JSON object of the form {{"responses": [...]}} where responses[i] '
+            f"is the plain-text answer to Task i.\n\n{tasks}"
+        )
+    
+    def _split_batched_response(self, text: str, expected: int) -> List[str]:
+        """Demux a batched LLM reply back into one answer per prompt"""
+        responses = json.loads(text).get('responses')
+        if not isinstance(responses, list) or len(responses) != expected:
+            raise ValueError(f"expected {expected} responses in batched reply")
+        return [str(response) for response in responses]
+    
+    def _batched_llm(self, prompts: List[str], shared_prefix: str = "") -> List[str]:
+        """Answer several prompts with a single LLM round-trip"""
+        batched_prompt = self._build_batched_prompt(prompts)
+        with self.rate_limiter.limit_sync():
             if self.llm_type == "gemini":
-                response = self.llm.generate_content(f"{prompt}\n\nData: {str(data)[:2000]}")
-                return response.text
+                response = self.llm.generate_content(
+                    shared_prefix + batched_prompt,
+                    generation_config={"response_mime_type": "application/json"}
+                )
+                self._record_usage(response)
+                text = response.text
             else:  # OpenAI
                 response = self.llm.chat.completions.create(
                     model="gpt-4o",
                     messages=[
-                        {"role": "system", "content": "You are a financial analysis expert."},
-                        {"role": "user", "content": f"{prompt}\n\nData: {str(data)[:2000]}"}
+                        {"role": "system", "content": self._system_prompt(shared_prefix)},
+                        {"role": "user", "content": batched_prompt}
                     ],
-                    max_tokens=500
+                    response_format={"type": "json_object"},
+                    max_tokens=500 * len(prompts)
                 )
-                return response.choices[0].message.content
-        except Exception as e:
-            return f"LLM analysis failed: {str(e)}"
+                self._record_usage(response)
+                text = response.choices[0].message.content
+        return self._split_batched_response(text, len(prompts))
     
-    def analyze_ticker_comprehensive(self, ticker: str, company_name: Optional[str] = None, force_new: bool = False, use_workflow: bool = True, use_rag: bool = True) -> Dict[str, Any]:
+    async def _batched_llm_async(self, prompts: List[str], shared_prefix: str = "") -> List[str]:
+        """Async variant of _batched_llm"""
+        batched_prompt = self._build_batched_prompt(prompts)
+        async with self.rate_limiter.limit():
+            if self.llm_type == "gemini":
+                response = await self.llm.generate_content_async(
+                    shared_prefix + batched_prompt,
+                    generation_config={"response_mime_type": "application/json"}
+                )
+                self._record_usage(response)
+                text = response.text
+            else:  # OpenAI
+                response = await self._async_llm().chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": self._system_prompt(shared_prefix)},
+                        {"role": "user", "content": batched_prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    max_tokens=500 * len(prompts)
+                )
+                self._record_usage(response)
+                text = response.choices[0].message.content
+        return self._split_batched_response(text, len(prompts))
+    
+    def _async_llm(self):
+        """Async OpenAI client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_llms.get(loop)
+        if client is None:
+            client = self._async_llms[loop] = get_openai_async_model()
+        return client
+    
+    async def aclose_async_llm(self):
+        """Close the running loop's async client (call before the loop ends)"""
+        client = self._async_llms.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+    
+    def analyze_ticker_comprehensive(self, ticker: str, company_name: Optional[str] = None, force_new: bool = False, use_workflow: bool = True, use_rag: bool = True, wait_for_report: bool = True) -> Dict[str, Any]:
         """Run comprehensive analysis on a ticker symbol
         
+        Blocking wrapper around analyze_ticker_comprehensive_async.
+        
         Args:
             ticker: Stock ticker symbol
             company_name: Optional company name
             force_new: If True, skip cache and run new analysis
             use_workflow: Use LangGraph workflow for orchestration
             use_rag: Use RAG enhancement for analysis context
+            wait_for_report: If False, return before the report files are written
+                (call wait_for_reports() later to collect them)
         """
-        
-        print(f"\n[ANALYZE] Starting analysis for {ticker.upper()}")
-        print(f"[INFO] RAG Enhancement: {'ON' if use_rag else 'OFF'}")
-        print(f"[INFO] Workflow Mode: {'ON' if use_workflow and WORKFLOW_AVAILABLE else 'OFF'}")
-        print("=" * 60)
-        
-        # Use workflow if available and requested
-        if use_workflow and WORKFLOW_AVAILABLE and self.workflow:
-            print("[WORKFLOW] Using LangGraph workflow for analysis")
+        async def run() -> Dict[str, Any]:
             try:
-                # Run async workflow
-                import asyncio
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                result = loop.run_until_complete(
-                    self.workflow.analyze_ticker_with_workflow(
-                        ticker, company_name, {'use_rag': use_rag}
-                    )
+                return await self.analyze_ticker_comprehensive_async(
+                    ticker, company_name, force_new=force_new, use_workflow=use_workflow, use_rag=use_rag,
+                    wait_for_report=wait_for_report
                 )
-                loop.close()
-                
-                # Generate visualization
-                if 'analysis_status' not in result or result.get('analysis_status') != 'failed':
-                    self._generate_workflow_visualization(result, ticker)
-                
-                return result
-                
-            except Exception as e:
-                print(f"[WARN] Workflow failed, falling back to sequential: {e}")
-                # Continue with sequential analysis
+            finally:
+                await self.aclose_async_llm()
         
-        # Check for recent analysis first (unless force_new is True)
+        return asyncio.run(run())
+    
+    async def analyze_ticker_comprehensive_async(self, ticker: str, company_name: Optional[str] = None, force_new: bool = False, use_workflow: bool = True, use_rag: bool = True, wait_for_report: bool = True) -> Dict[str, Any]:
+        """Run comprehensive analysis on a ticker symbol without blocking the event loop
+        
+        Args:
+            ticker: Stock ticker symbol
+            company_name: Optional company name
+            force_new: If True, skip cache and run new analysis
+            use_workflow: Use LangGraph workflow for orchestration
+            use_rag: Use RAG enhancement for analysis context
+            wait_for_report: If False, return before the report files are written
+                (call wait_for_reports() later to collect them)
+        """
+        
+        logger.info("\n[ANALYZE] Starting analysis for %s", ticker.upper())
+        logger.info("[INFO] RAG Enhancement: %s", 'ON' if use_rag else 'OFF')
+        logger.info("[INFO] Workflow Mode: %s", 'ON' if use_workflow and WORKFLOW_AVAILABLE else 'OFF')
+        logger.info("=" * 60)
+        
+        # Check for recent analysis first (unless force_new is True). A partial result
+        # is never served: the run falls through so only its failed stages are repeated
+        # (the successful ones come back from the stage cache)
         if not force_new:
+            memoized = analysis_cache.get(ticker, self.llm_type)
+            failed_stages = _failed_stages(_dig(memoized, 'result', 'analysis_status'))
+            if failed_stages:
+                logger.info("[CACHE] Memoized analysis has failed stages (%s), rerunning them", ', '.join(failed_stages))
+                memoized = None
+            if memoized:
+                logger.info("[CACHE] Using memoized analysis from %s", memoized['stored_at'])
+                logger.info("=" * 60)
+                
+                cached_results = dict(memoized['result'])
+                cached_results['is_cached'] = True
+                cached_results['cache_age_days'] = (datetime.now() - datetime.fromisoformat(memoized['stored_at'])).days
+                cached_results['original_analysis_date'] = cached_results.get('analysis_timestamp', memoized['stored_at'])
+                
+                return cached_results
+            
             recent_analysis = self.report_generator.load_recent_analysis(ticker, days_threshold=15)
-            if recent_analysis:
+            # Raw data files are saved as <key>_data.json
+            failed_stages = _failed_stages(_dig(recent_analysis, 'raw_data', 'analysis_status_data'))
+            if failed_stages:
+                logger.info("[CACHE] Recent analysis has failed stages (%s), rerunning them", ', '.join(failed_stages))
+                logger.info("=" * 60)
+            elif recent_analysis:
                 days_old = recent_analysis['days_old']
                 analysis_date = recent_analysis['metadata']['analysis_date']
                 
-                print(f"[CACHE] Found recent analysis from {days_old} days ago ({analysis_date})")
-                print(f"[CACHE] Using cached results from: {recent_analysis['analysis_folder']}")
-                print("=" * 60)
+                logger.info("[CACHE] Found recent analysis from %s days ago (%s)", days_old, analysis_date)
+                logger.info("[CACHE] Using cached results from: %s", recent_analysis['analysis_folder'])
+                logger.info("=" * 60)
                 
                 # Reconstruct the analysis results from cached data
                 cached_results = self._reconstruct_analysis_from_cache(recent_analysis)
@@ -149,42 +467,67 @@ class TickerAnalyzerAgent:
                 
                 return cached_results
             else:
-                print("[NEW] No recent analysis found. Running new comprehensive analysis...")
-                print("=" * 60)
+                logger.info("[NEW] No recent analysis found. Running new comprehensive analysis...")
+                logger.info("=" * 60)
+        
+        result = None
+        
+        # Analyzer stages reuse their own cached results unless a fresh run was forced
+        with stage_cache.refreshing(force_new):
+            # Use workflow if available and requested
+            if use_workflow and WORKFLOW_AVAILABLE and self.workflow:
+                logger.info("[WORKFLOW] Using LangGraph workflow for analysis")
+                try:
+                    result = await self.workflow.analyze_ticker_with_workflow(
+                        ticker, company_name, {'use_rag': use_rag}
+                    )
+                    
+                    # Generate visualization
+                    if 'analysis_status' not in result or result.get('analysis_status') != 'failed':
+                        await asyncio.to_thread(self._generate_workflow_visualization, result, ticker)
+                
+                except Exception as e:
+                    logger.warning("[WARN] Workflow failed, falling back to direct analysis: %s", e)
+                    # Continue without the workflow
         
+            if result is None:
+                result = await self._analyze_without_workflow(ticker, use_workflow, use_rag)
+        
+        if wait_for_report:
+            await asyncio.to_thread(self.wait_for_reports)
+        
+        # Memoize fully successful runs only (force_new only skips the lookup, not the write)
+        if 'error' not in result and not _failed_stages(result.get('analysis_status')):
+            analysis_cache.set(ticker, self.llm_type, result)
+        
+        return result
+    
+    async def _analyze_without_workflow(self, ticker: str, use_workflow: bool = True, use_rag: bool = True) -> Dict[str, Any]:
+        """Run the analysis stages concurrently on the event loop without LangGraph"""
         start_time = time.time()
-        analysis_results = {
-            'ticker': ticker.upper(),
-            'analysis_timestamp': datetime.now().isoformat(),
-            'llm_used': self.llm_type,
-            'company_info': {},
-            'cash_flow_analysis': {},
-            'profit_analysis': {},
-            'ceo_analysis': {},
-            'technology_analysis': {},
-            'sentiment_analysis': {},
-            'llm_insights': {},
-            'overall_scores': {},
-            'analysis_status': {}
-        }
+        analysis_results = AnalysisResults(
+            ticker=ticker.upper(),
+            analysis_timestamp=datetime.now().isoformat(),
+            llm_used=self.llm_type
+        ).to_dict()
         
         # 0. Pre-validation: Check if ticker is valid
-        print("[VALIDATION] Validating ticker and basic data availability...")
+        logger.info("[VALIDATION] Validating ticker and basic data availability...")
         try:
-            test_financial_data = self.cash_flow_analyzer.get_financial_data(ticker)
+            test_financial_data = await asyncio.to_thread(self.cash_flow_analyzer.get_financial_data, ticker)
             if 'error' in test_financial_data:
-                print(f"   [CRITICAL] {test_financial_data['error']}")
-                print(f"   [STOP] Cannot proceed with analysis - invalid ticker or no data available")
+                logger.error("   [CRITICAL] %s", test_financial_data['error'])
+                logger.error("   [STOP] Cannot proceed with analysis - invalid ticker or no data available")
                 return {
                     'ticker': ticker.upper(),
                     'error': test_financial_data['error'],
                     'analysis_timestamp': datetime.now().isoformat(),
                     'analysis_status': 'failed_validation'
                 }
-            print(f"   [OK] Ticker validation successful")
+            logger.info("   [OK] Ticker validation successful")
         except Exception as e:
             error_msg = f"Ticker validation failed: {str(e)}"
-            print(f"   [CRITICAL] {error_msg}")
+            logger.error("   [CRITICAL] %s", error_msg)
             return {
                 'ticker': ticker.upper(),
                 'error': error_msg,
@@ -192,150 +535,173 @@ class TickerAnalyzerAgent:
                 'analysis_status': 'failed_validation'
             }
         
-        # 1. Cash Flow Analysis
-        print("[CASH_FLOW] Running cash flow analysis...")
-        try:
-            cash_flow_result = self.cash_flow_analyzer.analyze_cash_flow(ticker)
-            
-            # Check if cash flow analysis failed
-            if 'error' in cash_flow_result:
-                print(f"   [FAIL] Cash flow analysis failed: {cash_flow_result['error']}")
-                analysis_results['analysis_status']['cash_flow'] = f"failed: {cash_flow_result['error']}"
-                # Don't return early here since other analyses might still work
+        # 1-5. The analyzers only read the ticker, so run them side by side
+        for _, tag, description, _, _, _ in ANALYSIS_STAGES:
+            logger.info("[%s] Running %s...", tag, description)
+        
+        # The analyzers are blocking clients, so each gets a worker thread while the loop waits on all of them
+        stage_results = await asyncio.gather(*(
+            asyncio.to_thread(getattr(getattr(self, analyzer), method), ticker)
+            for _, _, _, _, analyzer, method in ANALYSIS_STAGES
+        ), return_exceptions=True)
+        
+        for (name, _, _, display, _, _), result in zip(ANALYSIS_STAGES, stage_results):
+            if isinstance(result, Exception):
+                logger.error("   [FAIL] %s analysis failed: %s", display, result)
+                analysis_results['analysis_status'][name] = f'failed: {result}'
             else:
-                analysis_results['cash_flow_analysis'] = cash_flow_result
-                analysis_results['analysis_status']['cash_flow'] = 'completed'
-                
-                if 'analysis_summary' in cash_flow_result:
-                    analysis_results['company_info'].update(cash_flow_result['analysis_summary'])
-                
-                print(f"   [OK] Cash flow analysis completed")
-            
-        except Exception as e:
-            print(f"   [FAIL] Cash flow analysis failed: {e}")
-            analysis_results['analysis_status']['cash_flow'] = f'failed: {e}'
+                self._record_stage_result(analysis_results, name, display, result)
         
-        # 2. Profit Analysis
-        print("[PROFIT] Running profit mechanism analysis...")
-        try:
-            profit_result = self.profit_analyzer.analyze_profit_mechanisms(ticker)
-            analysis_results['profit_analysis'] = profit_result
-            analysis_results['analysis_status']['profit'] = 'completed'
-            print(f"   [OK] Profit analysis completed")
-            
-        except Exception as e:
-            print(f"   [FAIL] Profit analysis failed: {e}")
-            analysis_results['analysis_status']['profit'] = f'failed: {e}'
+        # RAG contexts depend on the company info from the cash flow stage
+        investment_context = None
+        if use_rag:
+            investment_context = await asyncio.to_thread(self._add_rag_contexts, analysis_results)
         
-        # 3. CEO Analysis
-        print("[CEO] Running CEO & leadership analysis...")
-        try:
-            ceo_result = self.ceo_analyzer.analyze_ceo_complete(ticker)
-            analysis_results['ceo_analysis'] = ceo_result
-            analysis_results['analysis_status']['ceo'] = 'completed'
-            print(f"   [OK] CEO analysis completed")
-            
-        except Exception as e:
-            print(f"   [FAIL] CEO analysis failed: {e}")
-            analysis_results['analysis_status']['ceo'] = f'failed: {e}'
+        # 6-8. Insights, scores and reports
+        await self._finalize_analysis_async(analysis_results, ticker, use_rag, investment_context)
         
-        # 4. Technology Analysis
-        print("[TECH] Running technology & IP analysis...")
-        try:
-            tech_result = self.technology_analyzer.analyze_technology_complete(ticker)
-            analysis_results['technology_analysis'] = tech_result
-            analysis_results['analysis_status']['technology'] = 'completed'
-            print(f"   [OK] Technology analysis completed")
-            
-        except Exception as e:
-            print(f"   [FAIL] Technology analysis failed: {e}")
-            analysis_results['analysis_status']['technology'] = f'failed: {e}'
+        # Generate workflow visualization if requested
+        if use_workflow and WORKFLOW_AVAILABLE and self.visualizer:
+            await asyncio.to_thread(self._generate_workflow_visualization, analysis_results, ticker)
+        
+        # Analysis summary
+        total_time = time.time() - start_time
+        analysis_results['analysis_duration'] = f"{total_time:.2f} seconds"
+        
+        logger.info("\n" + "=" * 60)
+        logger.info("[COMPLETE] Analysis completed in %.2f seconds", total_time)
+        logger.info("[SAVED] Results saved in: reports/%s/", ticker.upper())
         
-        # 5. Sentiment Analysis (with RAG enhancement)
-        print("[SENTIMENT] Running market sentiment analysis...")
+        return analysis_results
+    
+    def _record_stage_result(self, analysis_results: Dict[str, Any], name: str, display: str, result: Dict[str, Any]):
+        """Store one stage's result and status in analysis_results"""
+        if name == 'cash_flow':
+            # Check if cash flow analysis failed
+            if 'error' in result:
+                logger.error("   [FAIL] Cash flow analysis failed: %s", result['error'])
+                analysis_results['analysis_status']['cash_flow'] = f"failed: {result['error']}"
+                # Don't return early here since other analyses might still work
+                return
+            if 'analysis_summary' in result:
+                analysis_results['company_info'].update(result['analysis_summary'])
+        
+        analysis_results[f'{name}_analysis'] = result
+        analysis_results['analysis_status'][name] = 'completed'
+        logger.info("   [OK] %s analysis completed", display)
+    
+    def _add_rag_contexts(self, analysis_results: Dict[str, Any]) -> Optional[str]:
+        """Fetch sentiment and investment knowledge in one batched RAG search
+        
+        Sentiment knowledge is attached to a successful sentiment result; the
+        investment context is returned for the insights (None if the search failed).
+        """
         try:
-            # Get RAG context if enabled
-            rag_context = ""
-            if use_rag:
-                rag_context = self.knowledge_store.get_context_for_analysis(
-                    "sentiment",
-                    analysis_results.get('company_info', {})
-                )
-                if rag_context:
-                    print("   [RAG] Enhanced with sentiment analysis knowledge")
-            
-            sentiment_result = self.sentiment_analyzer.analyze_sentiment_complete(ticker)
-            
-            # Add RAG context to result
-            if rag_context and isinstance(sentiment_result, dict) and 'error' not in sentiment_result:
-                sentiment_result['rag_context'] = rag_context
-                sentiment_result['enhanced'] = True
-            
-            analysis_results['sentiment_analysis'] = sentiment_result
-            analysis_results['analysis_status']['sentiment'] = 'completed'
-            print(f"   [OK] Sentiment analysis completed")
-            
+            rag_contexts = self.knowledge_store.get_contexts_for_analyses(
+                ["sentiment", "investment"],
+                analysis_results.get('company_info', {})
+            )
         except Exception as e:
-            print(f"   [FAIL] Sentiment analysis failed: {e}")
-            analysis_results['analysis_status']['sentiment'] = f'failed: {e}'
+            logger.warning("   [WARN] RAG context unavailable: %s", e)
+            return None
+        
+        if rag_contexts["investment"]:
+            logger.info("   [RAG] Enhanced with investment framework knowledge")
+        
+        sentiment_result = analysis_results.get('sentiment_analysis')
+        if not isinstance(sentiment_result, dict) or not sentiment_result or 'error' in sentiment_result:
+            return rag_contexts["investment"]
+        
+        rag_context = rag_contexts["sentiment"]
+        if rag_context:
+            logger.info("   [RAG] Enhanced with sentiment analysis knowledge")
+            sentiment_result['rag_context'] = rag_context
+            sentiment_result['enhanced'] = True
+        return rag_contexts["investment"]
+    
+    async def _finalize_analysis_async(self, analysis_results: Dict[str, Any], ticker: str, use_rag: bool = True, investment_context: Optional[str] = None) -> Dict[str, Any]:
+        """Generate insights, overall scores and reports for collected analysis results"""
+        investment_context = await asyncio.to_thread(
+            self._get_investment_context, analysis_results, use_rag, investment_context
+        )
         
-        # 6. Generate LLM Insights (with RAG enhancement)
-        print("[AI] Generating AI insights...")
+        # Generate LLM Insights (with RAG enhancement)
+        logger.info("[AI] Generating AI insights...")
+        self.token_usage = {'input_tokens': 0, 'output_tokens': 0, 'llm_calls': 0}
         try:
-            # Get investment context from RAG if enabled
-            investment_context = ""
-            if use_rag:
-                investment_context = self.knowledge_store.get_context_for_analysis(
-                    "investment",
-                    analysis_results.get('company_info', {})
-                )
-                if investment_context:
-                    print("   [RAG] Enhanced with investment framework knowledge")
-            
-            insights = self.generate_llm_insights(analysis_results, investment_context)
+            insights = await self.generate_llm_insights_async(analysis_results, investment_context)
             analysis_results['llm_insights'] = insights
-            print(f"   [OK] AI insights generated")
+            logger.info("   [OK] AI insights generated")
             
         except Exception as e:
-            print(f"   [FAIL] AI insights generation failed: {e}")
+            logger.error("   [FAIL] AI insights generation failed: %s", e)
             analysis_results['llm_insights'] = {'error': str(e)}
         
-        # 7. Calculate Overall Scores
+        analysis_results['token_usage'] = dict(self.token_usage)
+        
+        return await asyncio.to_thread(self._score_and_report, analysis_results, ticker, use_rag)
+    
+    def _get_investment_context(self, analysis_results: Dict[str, Any], use_rag: bool, investment_context: Optional[str] = None) -> str:
+        """Get investment framework context from RAG if enabled"""
+        if investment_context is not None:
+            return investment_context
+        if not use_rag:
+            return ""
+        
+        investment_context = self.knowledge_store.get_context_for_analysis(
+            "investment",
+            analysis_results.get('company_info', {})
+        )
+        if investment_context:
+            logger.info("   [RAG] Enhanced with investment framework knowledge")
+        return investment_context
+    
+    def _score_and_report(self, analysis_results: Dict[str, Any], ticker: str, use_rag: bool = True) -> Dict[str, Any]:
+        """Calculate overall scores and start writing the report files
+        
+        The report is written on a background thread from a snapshot of the
+        results; wait_for_reports() attaches its 'report_files'.
+        """
+        # Calculate Overall Scores
         analysis_results['overall_scores'] = self.calculate_overall_scores(analysis_results)
         
-        # 8. Generate Reports
-        print("[REPORT] Generating comprehensive report...")
-        try:
-            report_result = self.report_generator.generate_complete_report(ticker, analysis_results)
-            analysis_results['report_files'] = report_result
-            print(f"   [OK] Report generated: {report_result.get('report_file', 'N/A')}")
-            
-        except Exception as e:
-            print(f"   [FAIL] Report generation failed: {e}")
-            analysis_results['report_files'] = {'error': str(e)}
+        # Generate Reports
+        logger.info("[REPORT] Generating comprehensive report...")
+        future = self._report_executor.submit(self._generate_report, ticker, dict(analysis_results))
+        self._pending_reports.append((analysis_results, future))
         
         # Add RAG enhancement indicators
         if use_rag:
             analysis_results['rag_enhanced'] = True
             analysis_results['knowledge_context_used'] = True
         
-        # Generate workflow visualization if requested
-        if use_workflow and WORKFLOW_AVAILABLE and self.visualizer:
-            self._generate_workflow_visualization(analysis_results, ticker)
-        
-        # Analysis summary
-        total_time = time.time() - start_time
-        analysis_results['analysis_duration'] = f"{total_time:.2f} seconds"
-        
-        print("\n" + "=" * 60)
-        print(f"[COMPLETE] Analysis completed in {total_time:.2f} seconds")
-        print(f"[SAVED] Results saved in: reports/{ticker.upper()}/")
-        
         return analysis_results
     
-    def generate_llm_insights(self, analysis_results: Dict[str, Any], investment_context: str = "") -> Dict[str, str]:
-        """Generate AI-powered insights from the analysis results"""
-        insights = {}
+    def _generate_report(self, ticker: str, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Write the report files for one analysis, returning their paths or an error dict"""
+        try:
+            report_result = self.report_generator.generate_complete_report(ticker, analysis_results)
+            logger.info("   [OK] Report generated: %s", report_result.get('report_file', 'N/A'))
+            return report_result
+            
+        except Exception as e:
+            logger.error("   [FAIL] Report generation failed: %s", e)
+            return {'error': str(e)}
+    
+    def wait_for_reports(self) -> List[Dict[str, Any]]:
+        """Block until every report still being written is done
+        
+        Sets 'report_files' on each analysis result whose report was pending
+        and returns those results.
+        """
+        pending, self._pending_reports = self._pending_reports, []
+        for analysis_results, future in pending:
+            analysis_results['report_files'] = future.result()
+        return [analysis_results for analysis_results, _ in pending]
+    
+    def _build_insight_requests(self, analysis_results: Dict[str, Any]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Build the (prompt, data) pair for each insight the results support"""
+        insight_requests = {}
         
         # Financial insights
         if analysis_results.get('cash_flow_analysis') and analysis_results.get('profit_analysis'):
@@ -350,7 +716,7 @@ class TickerAnalyzerAgent:
                 'cash_flow': analysis_results['cash_flow_analysis'],
                 'profit': analysis_results['profit_analysis']
             }
-            insights['financial_insight'] = self.get_llm_analysis(financial_prompt, financial_data)
+            insight_requests['financial_insight'] = (financial_prompt, financial_data)
         
         # Leadership insights
         if analysis_results.get('ceo_analysis'):
@@ -361,7 +727,7 @@ class TickerAnalyzerAgent:
             3. Leadership's alignment with future market trends
             Keep it under 150 words.
             """
-            insights['leadership_insight'] = self.get_llm_analysis(leadership_prompt, analysis_results['ceo_analysis'])
+            insight_requests['leadership_insight'] = (leadership_prompt, analysis_results['ceo_analysis'])
         
         # Technology insights
         if analysis_results.get('technology_analysis'):
@@ -372,7 +738,7 @@ class TickerAnalyzerAgent:
             3. Technology risks and opportunities for the future
             Keep it under 150 words.
             """
-            insights['technology_insight'] = self.get_llm_analysis(tech_prompt, analysis_results['technology_analysis'])
+            insight_requests['technology_insight'] = (tech_prompt, analysis_results['technology_analysis'])
         
         # Market sentiment insights
         if analysis_results.get('sentiment_analysis'):
@@ -383,9 +749,53 @@ class TickerAnalyzerAgent:
             3. Key themes driving positive or negative sentiment
             Keep it under 150 words.
             """
-            insights['sentiment_insight'] = self.get_llm_analysis(sentiment_prompt, analysis_results['sentiment_analysis'])
+            insight_requests['sentiment_insight'] = (sentiment_prompt, analysis_results['sentiment_analysis'])
+        
+        return insight_requests
+    
+    def generate_llm_insights(self, analysis_results: Dict[str, Any], investment_context: str = "") -> Dict[str, str]:
+        """Generate AI-powered insights from the analysis results
+        
+        All insight prompts go out in one batched request; if the batched reply
+        can't be used, the prompts are sent individually and concurrently instead.
+        """
+        insight_requests = self._build_insight_requests(analysis_results)
+        if not insight_requests:
+            return {}
+        shared_prefix = self._build_shared_prefix(analysis_results, investment_context)
+        
+        try:
+            responses = self._batched_llm([
+                f"{prompt}\n\nData: {_prompt_data(data)}" for prompt, data in insight_requests.values()
+            ], shared_prefix)
+        except Exception as e:
+            logger.warning("   [WARN] Batched insights failed, sending prompts individually: %s", e)
+            with ThreadPoolExecutor(max_workers=len(insight_requests)) as executor:
+                responses = list(executor.map(
+                    lambda request: self.get_llm_analysis(request[0], request[1], shared_prefix),
+                    insight_requests.values()
+                ))
+        
+        return dict(zip(insight_requests.keys(), responses))
+    
+    async def generate_llm_insights_async(self, analysis_results: Dict[str, Any], investment_context: str = "") -> Dict[str, str]:
+        """Async variant of generate_llm_insights"""
+        insight_requests = self._build_insight_requests(analysis_results)
+        if not insight_requests:
+            return {}
+        shared_prefix = self._build_shared_prefix(analysis_results, investment_context)
+        
+        try:
+            responses = await self._batched_llm_async([
+                f"{prompt}\n\nData: {_prompt_data(data)}" for prompt, data in insight_requests.values()
+            ], shared_prefix)
+        except Exception as e:
+            logger.warning("   [WARN] Batched insights failed, sending prompts individually: %s", e)
+            responses = await asyncio.gather(*(
+                self.get_llm_analysis_async(prompt, data, shared_prefix) for prompt, data in insight_requests.values()
+            ))
         
-        return insights
+        return dict(zip(insight_requests.keys(), responses))
     
     def calculate_overall_scores(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate overall scores and ratings"""
@@ -400,79 +810,46 @@ class TickerAnalyzerAgent:
         }
         
         # Extract individual scores
-        cash_flow = analysis_results.get('cash_flow_analysis', {})
-        ceo_analysis = analysis_results.get('ceo_analysis', {})
-        tech_analysis = analysis_results.get('technology_analysis', {})
-        sentiment_analysis = analysis_results.get('sentiment_analysis', {})
-        
-        # Future focus (R&D investment)
-        if 'analysis_summary' in cash_flow:
-            scores['future_focus_score'] = cash_flow['analysis_summary'].get('future_focus_score', 0)
-        
-        # Leadership score
-        if 'analysis_summary' in ceo_analysis:
-            scores['leadership_score'] = ceo_analysis['analysis_summary'].get('future_impact_score', 0)
-        
-        # Technology score
-        if 'analysis_summary' in tech_analysis:
-            scores['technology_score'] = tech_analysis['analysis_summary'].get('overall_tech_score', 0)
-        
-        # Sentiment score (normalize to 0-10)
-        if 'analysis_summary' in sentiment_analysis:
-            sentiment_raw = sentiment_analysis['analysis_summary'].get('overall_sentiment_score', 0)
-            # Convert from -1 to 1 range to 0-10 range
-            scores['sentiment_score'] = (sentiment_raw + 1) * 5
-        
-        # Financial health (simplified calculation)
-        profit_data = analysis_results.get('profit_analysis', {})
-        if 'company_metrics' in profit_data:
-            roe = profit_data['company_metrics'].get('roe')
-            profit_margin = profit_data['company_metrics'].get('profit_margins_current', {}).get('profit_margin')
-            
-            financial_score = 5  # baseline
-            if roe and roe > 0.15:
-                financial_score += 2
-            if profit_margin and profit_margin > 0.1:
-                financial_score += 2
-            
-            scores['financial_health_score'] = min(financial_score, 10)
+        for key, extract in zip(SCORE_KEYS, SCORE_EXTRACTORS):
+            scores[key] = extract(analysis_results)
         
         # Overall investment score (weighted average)
-        weights = {
-            'future_focus': 0.25,
-            'leadership': 0.2,
-            'technology': 0.25,
-            'financial': 0.2,
-            'sentiment': 0.1
-        }
-        
-        overall_score = (
-            scores['future_focus_score'] * weights['future_focus'] +
-            scores['leadership_score'] * weights['leadership'] +
-            scores['technology_score'] * weights['technology'] +
-            scores['financial_health_score'] * weights['financial'] +
-            scores['sentiment_score'] * weights['sentiment']
-        )
+        overall_score = float(np.fromiter((scores[key] for key in SCORE_KEYS), dtype=float) @ SCORE_WEIGHTS)
         
         scores['overall_investment_score'] = round(overall_score, 2)
         
-        # Risk level assessment
-        if overall_score >= 7.5:
-            scores['risk_level'] = 'low'
-        elif overall_score >= 5.5:
-            scores['risk_level'] = 'medium'
-        else:
-            scores['risk_level'] = 'high'
+        # Risk level assessment (high below 5.5, low from 7.5)
+        scores['risk_level'] = RISK_LEVELS[(overall_score >= 5.5) + (overall_score >= 7.5)]
         
         return scores
     
+    def score_matrix(self, analyses: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Stack the sub-scores of several analyses and weight them in one matrix product
+        
+        Args:
+            analyses: Results of analyze_ticker_comprehensive, one per ticker
+        
+        Returns:
+            DataFrame indexed by ticker with one column per sub-score plus the
+            overall investment score, sorted best first
+        """
+        tickers = [analysis.get('ticker', '') for analysis in analyses]
+        matrix = np.array([
+            [_dig(analysis, 'overall_scores', key) or 0 for key in SCORE_KEYS]
+            for analysis in analyses
+        ], dtype=float).reshape(len(analyses), len(SCORE_KEYS))
+        
+        frame = pd.DataFrame(matrix, index=pd.Index(tickers, name='ticker'), columns=list(SCORE_KEYS))
+        frame['overall_investment_score'] = (matrix @ SCORE_WEIGHTS).round(2)
+        return frame.sort_values('overall_investment_score', ascending=False)
+    
     def _generate_workflow_visualization(self, analysis_results: Dict[str, Any], ticker: str):
         """Generate workflow visualization for the analysis"""
         if not WORKFLOW_AVAILABLE or not self.visualizer:
             return
             
         try:
-            print("[VISUALIZE] Generating workflow visualization...")
+            logger.info("[VISUALIZE] Generating workflow visualization...")
             
             # Get workflow structure
             workflow_data = self.workflow.get_workflow_visualization()
@@ -485,10 +862,10 @@ class TickerAnalyzerAgent:
             )
             
             analysis_results['workflow_visualizations'] = viz_paths
-            print(f"   [OK] Workflow visualization generated")
+            logger.info("   [OK] Workflow visualization generated")
             
         except Exception as e:
-            print(f"   [WARN] Workflow visualization failed: {e}")
+            logger.warning("   [WARN] Workflow visualization failed: %s", e)
             analysis_results['workflow_visualizations'] = {'error': str(e)}
     
     def _reconstruct_analysis_from_cache(self, recent_analysis: Dict[str, Any]) -> Dict[str, Any]:
@@ -497,25 +874,23 @@ class TickerAnalyzerAgent:
         raw_data = recent_analysis['raw_data']
         
         # Create the analysis results structure
-        analysis_results = {
-            'ticker': metadata['ticker'],
-            'analysis_timestamp': metadata['analysis_date'],
-            'llm_used': metadata.get('llm_used', 'cached'),
-            'company_info': {},
-            'cash_flow_analysis': raw_data.get('cash_flow_analysis', {}),
-            'profit_analysis': raw_data.get('profit_analysis', {}),
-            'ceo_analysis': raw_data.get('ceo_analysis', {}),
-            'technology_analysis': raw_data.get('technology_analysis', {}),
-            'sentiment_analysis': raw_data.get('sentiment_analysis', {}),
-            'llm_insights': raw_data.get('llm_insights', {}),
-            'overall_scores': metadata.get('overall_scores', {}),
-            'analysis_status': {},
-            'analysis_duration': metadata.get('analysis_duration', 'cached'),
-            'report_files': {
-                'analysis_folder': recent_analysis['analysis_folder'],
-                'report_file': 'See analysis folder for reports',
-                'metadata_file': f"{recent_analysis['analysis_folder']}/analysis_metadata.json"
-            }
+        analysis_results = AnalysisResults(
+            ticker=metadata['ticker'],
+            analysis_timestamp=metadata['analysis_date'],
+            llm_used=metadata.get('llm_used', 'cached'),
+            cash_flow_analysis=raw_data.get('cash_flow_analysis', {}),
+            profit_analysis=raw_data.get('profit_analysis', {}),
+            ceo_analysis=raw_data.get('ceo_analysis', {}),
+            technology_analysis=raw_data.get('technology_analysis', {}),
+            sentiment_analysis=raw_data.get('sentiment_analysis', {}),
+            llm_insights=raw_data.get('llm_insights', {}),
+            overall_scores=metadata.get('overall_scores', {})
+        ).to_dict()
+        analysis_results['analysis_duration'] = metadata.get('analysis_duration', 'cached')
+        analysis_results['report_files'] = {
+            'analysis_folder': recent_analysis['analysis_folder'],
+            'report_file': 'See analysis folder for reports',
+            'metadata_file': f"{recent_analysis['analysis_folder']}/analysis_metadata.json"
         }
         
         # Set analysis status for all components that have data
@@ -527,8 +902,9 @@ class TickerAnalyzerAgent:
                 analysis_results['analysis_status'][component] = 'not available in cache'
         
         # Extract company info from cash flow analysis if available
-        if 'cash_flow_analysis' in raw_data and 'analysis_summary' in raw_data['cash_flow_analysis']:
-            analysis_results['company_info'].update(raw_data['cash_flow_analysis']['analysis_summary'])
+        cash_flow_summary = _dig(raw_data, 'cash_flow_analysis', 'analysis_summary')
+        if cash_flow_summary:
+            analysis_results['company_info'].update(cash_flow_summary)
         
         return analysis_results
     
@@ -536,32 +912,47 @@ class TickerAnalyzerAgent:
         """Get a quick summary of the analysis results"""
         try:
             # Check if analysis exists
-            import os
             reports_dir = f"reports/{ticker.upper()}"
             if not os.path.exists(reports_dir):
                 return f"No analysis found for {ticker}. Run analyze_ticker_comprehensive() first."
             
-            # Find the latest report file
-            report_files = [f for f in os.listdir(reports_dir) if f.endswith('.md')]
-            if not report_files:
+            # Find the most recently written report file
+            latest_report = self._latest_report_entry(reports_dir)
+            if latest_report is None:
                 return f"No report file found for {ticker}."
             
-            latest_report = max(report_files)
-            report_path = os.path.join(reports_dir, latest_report)
+            # Repeated polls for an unchanged report reuse the extracted summary
+            mtime = latest_report.stat().st_mtime
+            cached = self._summary_cache.get(ticker.upper())
+            if cached and cached[0] == latest_report.path and cached[1] == mtime:
+                return cached[2]
             
-            with open(report_path, 'r', encoding='utf-8') as f:
+            with open(latest_report.path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             # Extract executive summary
-            if "## Executive Summary" in content:
-                start_idx = content.index("## Executive Summary")
-                end_idx = content.index("---", start_idx + 1)
-                return content[start_idx:end_idx].strip()
+            match = EXEC_SUMMARY_PATTERN.search(content)
+            if match:
+                summary = match.group(1).strip()
+                self._summary_cache[ticker.upper()] = (latest_report.path, mtime, summary)
+                return summary
             else:
                 return f"Report found for {ticker}, but summary extraction failed."
                 
         except Exception as e:
             return f"Error retrieving summary for {ticker}: {str(e)}"
+    
+    def _latest_report_entry(self, reports_dir: str) -> Optional[os.DirEntry]:
+        """Return the newest .md report in the ticker folder or its dated analysis folders"""
+        candidates = []
+        with os.scandir(reports_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith('.md'):
+                    candidates.append(entry)
+                elif entry.is_dir():
+                    with os.scandir(entry.path) as sub_entries:
+                        candidates.extend(e for e in sub_entries if e.is_file() and e.name.endswith('.md'))
+        return max(candidates, key=lambda e: e.stat().st_mtime, default=None)
 
 
 # Convenience function for direct usage
@@ -577,4 +968,38 @@ def analyze_ticker(ticker: str, use_llm: str = "gemini", force_new: bool = False
         Complete analysis results
     """
     agent = TickerAnalyzerAgent(use_llm=use_llm)
-    return agent.analyze_ticker_comprehensive(ticker, force_new=force_new)
\ No newline at end of file
+    return agent.analyze_ticker_comprehensive(ticker, force_new=force_new)
+
+async def analyze_tickers_async(tickers: List[str], use_llm: str = "gemini", force_new: bool = False, max_concurrency: int = 8) -> List[Dict[str, Any]]:
+    """Analyze several tickers concurrently, e.g. for a screening run
+    
+    Args:
+        tickers: Stock ticker symbols
+        use_llm: "gemini" for Gemini Pro or "openai" for ChatGPT-4o
+        force_new: If True, skip cache and run new analyses
+        max_concurrency: Maximum number of tickers analyzed at the same time
+    
+    Returns:
+        One result per ticker, in input order ({'error': ...} for failed tickers)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def analyze_one(ticker: str) -> Dict[str, Any]:
+        async with semaphore:
+            # Separate agents keep token usage and pending reports per ticker
+            agent = TickerAnalyzerAgent(use_llm=use_llm)
+            try:
+                return await agent.analyze_ticker_comprehensive_async(ticker, force_new=force_new)
+            finally:
+                await agent.aclose_async_llm()
+    
+    results = await asyncio.gather(*(analyze_one(ticker) for ticker in tickers), return_exceptions=True)
+    return [
+        {'error': str(result), 'ticker': ticker.upper()} if isinstance(result, Exception) else result
+        for ticker, result in zip(tickers, results)
+    ]
+
+
+def analyze_tickers(tickers: List[str], use_llm: str = "gemini", force_new: bool = False, max_concurrency: int = 8) -> List[Dict[str, Any]]:
+    """Convenience function to analyze several tickers concurrently (see analyze_tickers_async)"""
+    return asyncio.run(analyze_tickers_async(tickers, use_llm, force_new, max_concurrency))
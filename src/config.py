@@ -1,10 +1,44 @@
+import logging
 import os
+import sys
+from functools import lru_cache
 from dotenv import load_dotenv
 import google.generativeai as genai
-from openai import OpenAI
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from src.utils.display_config import SafeTextFormatter
+
+try:
+    import h2  # noqa: F401 - lets httpx negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 load_dotenv()
 
+# Progress output of the agent goes through the "src" loggers (AGENT_LOG sets the
+# level); messages are printed as-is, with emoji replaced on ASCII-only consoles.
+# Only this package is configured, so library loggers such as httpx stay quiet.
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(SafeTextFormatter('%(message)s'))
+_package_logger = logging.getLogger("src")
+if not _package_logger.handlers:
+    _package_logger.addHandler(_log_handler)
+    _package_logger.setLevel(os.environ.get("AGENT_LOG", "INFO").upper())
+    _package_logger.propagate = False
+
+# Use the libuv-based event loop for asyncio.run when available (not on Windows);
+# set DISABLE_UVLOOP=1 to keep the standard loop
+if sys.platform != "win32" and os.environ.get("DISABLE_UVLOOP") != "1":
+    try:
+        import uvloop
+        uvloop.install()
+        UVLOOP_AVAILABLE = True
+    except ImportError:
+        UVLOOP_AVAILABLE = False
+else:
+    UVLOOP_AVAILABLE = False
+
 # API Keys
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -15,29 +49,46 @@ SERPER_API_KEY = os.environ.get("SERPER_API_KEY")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
-# LLM Models
+# Shared connection pool for outbound LLM and search API calls, so repeated
+# requests to the same host reuse one TLS connection instead of handshaking again
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+http_client = httpx.Client(http2=HTTP2_AVAILABLE, timeout=30, limits=HTTP_LIMITS)
+
+# LLM Models (each client is built once per process and shared)
+@lru_cache(maxsize=1)
 def get_gemini_model():
     """Get Gemini Pro model (default)"""
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY not found in environment")
     return genai.GenerativeModel('gemini-2.5-pro')
 
+@lru_cache(maxsize=1)
 def get_openai_model():
     """Get ChatGPT-4o model (alternative)"""
     if not OPENAI_API_KEY:
         raise ValueError("OPENAI_API_KEY not found in environment")
-    return OpenAI(api_key=OPENAI_API_KEY)
+    return OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
 
-# Default LLM (Gemini Pro)
-try:
-    default_llm = get_gemini_model()
-    llm_type = "gemini"
-except ValueError:
+def get_openai_async_model():
+    """Get async ChatGPT-4o client for use inside an event loop"""
+    if not OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY not found in environment")
+    # Async pools are bound to the event loop that uses them, so each client gets its own
+    return AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=30, limits=HTTP_LIMITS)
+    )
+
+# Default LLM (Gemini Pro), resolved on first use so importing this module never needs a key
+def get_default_llm():
+    """Get (model, llm_type) for the first provider with an API key"""
     try:
-        default_llm = get_openai_model()
-        llm_type = "openai"
+        return get_gemini_model(), "gemini"
     except ValueError:
-        raise ValueError("No valid LLM API key found")
+        try:
+            return get_openai_model(), "openai"
+        except ValueError:
+            raise ValueError("No valid LLM API key found")
 
 # Legacy support for smolagents
 HF_TOKEN = os.environ.get("HF_TOKEN")
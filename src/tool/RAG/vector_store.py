@@ -2,13 +2,20 @@
 Vector Store for RAG system - stores and retrieves financial knowledge
 """
 
+import contextlib
 import os
-import json
+import hashlib
+import functools
+import threading
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import numpy as np
 from datetime import datetime
 
+from src.utils.json_utils import dump_json, load_json
+
 try:
     from sentence_transformers import SentenceTransformer
     SENTENCE_TRANSFORMERS_AVAILABLE = True
@@ -24,10 +31,132 @@ except ImportError:
     print("[WARN] faiss not available. Install with: pip install faiss-cpu")
 
 
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+try:
+    import onnxruntime  # noqa: F401 - ONNX backend of sentence-transformers
+    import optimum  # noqa: F401 - exports and quantizes the ONNX encoder
+    ONNX_RUNTIME_AVAILABLE = True
+except ImportError:
+    ONNX_RUNTIME_AVAILABLE = False
+
+# Dynamically quantized int8 export shipped with all-MiniLM-L6-v2 (VNNI dot products on x86)
+ONNX_ENCODER_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Locally quantized exports for models without a shipped int8 build
+ONNX_EXPORT_DIR = Path("~/.cache/ai-ticker/onnx").expanduser()
+
+
+def _detect_device() -> str:
+    """Pick the fastest available torch device: CUDA, then Apple MPS, then CPU"""
+    if TORCH_AVAILABLE:
+        if torch.cuda.is_available():
+            return "cuda"
+        mps = getattr(torch.backends, "mps", None)
+        if mps is not None and mps.is_available():
+            return "mps"
+    return "cpu"
+
+
+def _load_onnx_encoder(model_name: str):
+    """Load an int8 ONNX build of the encoder, quantizing one locally if none is shipped"""
+    try:
+        return SentenceTransformer(
+            model_name,
+            backend="onnx",
+            model_kwargs={"file_name": ONNX_ENCODER_FILE, "provider": "CPUExecutionProvider"}
+        )
+    except Exception as e:
+        print(f"[WARN] Shipped ONNX int8 encoder unavailable, quantizing locally: {e}")
+    
+    try:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        
+        export_dir = ONNX_EXPORT_DIR / model_name.replace('/', '__')
+        quantized = sorted(export_dir.glob("onnx/model_qint8_*.onnx"))
+        if not quantized:
+            # Export to fp32 ONNX, then dynamically quantize the weights to int8
+            fp32_model = SentenceTransformer(model_name, backend="onnx")
+            fp32_model.save(str(export_dir))
+            export_dynamic_quantized_onnx_model(fp32_model, "avx2", str(export_dir))
+            quantized = sorted(export_dir.glob("onnx/model_qint8_*.onnx"))
+        
+        return SentenceTransformer(
+            str(export_dir),
+            backend="onnx",
+            model_kwargs={"file_name": f"onnx/{quantized[0].name}", "provider": "CPUExecutionProvider"}
+        )
+    except Exception as e:
+        print(f"[WARN] Could not build a local ONNX int8 encoder: {e}")
+        return None
+
+
+# Torch dtypes for the encoder weights ("auto": half precision on GPUs, fp32 on CPU)
+ENCODER_PRECISIONS = ("auto", "fp32", "bf16", "fp16")
+
+
+@functools.lru_cache(maxsize=4)
+def get_encoder(model_name: str = 'all-MiniLM-L6-v2', backend: str = "onnx", precision: str = "auto"):
+    """Load the sentence transformer once per process
+    
+    GPUs (CUDA / MPS) run the regular model; on CPU the int8 ONNX build is
+    preferred (backend="onnx"), with torch using every core as the fallback.
+    The torch model is put in eval mode and cast to the requested precision.
+    """
+    device = _detect_device()
+    
+    if backend == "onnx" and device == "cpu" and ONNX_RUNTIME_AVAILABLE:
+        encoder = _load_onnx_encoder(model_name)
+        if encoder is not None:
+            print("[OK] Sentence transformer loaded (ONNX int8)")
+            return encoder
+    
+    if device == "cpu" and TORCH_AVAILABLE:
+        torch.set_num_threads(os.cpu_count() or 1)
+    
+    encoder = SentenceTransformer(model_name, device=device)
+    encoder.eval()
+    
+    if precision == "auto":
+        precision = "fp32" if device == "cpu" else "fp16"
+    if precision == "bf16":
+        encoder = encoder.to(torch.bfloat16)
+    elif precision == "fp16":
+        encoder = encoder.half()
+    encoder.precision = precision
+    
+    print(f"[OK] Sentence transformer loaded ({device}, {precision})")
+    return encoder
+
+
+# Search query per analysis type: (template, company_data field filling {value})
+QUERY_TEMPLATES = {
+    "cash_flow": ("cash flow analysis revenue R&D spending {value}", "sector"),
+    "profit": ("profit margins profitability financial ratios {value}", "industry"),
+    "ceo": ("CEO leadership analysis executive assessment {value}", "ceo_name"),
+    "technology": ("technology analysis patents competitive advantage innovation {value}", "sector"),
+    "sentiment": ("sentiment analysis market perception social media news {value}", "ticker"),
+    "investment": ("investment recommendation framework analysis methodology {value}", "sector"),
+}
+
+
+@functools.lru_cache(maxsize=2048)
+def _render_query(analysis_type: str, value: str) -> str:
+    """Fill the query template; keyed only on the one company field the template uses"""
+    template = QUERY_TEMPLATES.get(analysis_type)
+    if template is None:
+        return f"{analysis_type} analysis"
+    return template[0].format(value=value)
+
+
 class FinancialKnowledgeStore:
     """Vector store for financial analysis knowledge"""
     
-    def __init__(self, store_path: str = "src/tool/RAG/knowledge_store"):
+    def __init__(self, store_path: str = "src/tool/RAG/knowledge_store", index_spec: Optional[str] = None, encoder_backend: str = "onnx", encoder_precision: str = "auto"):
         self.store_path = Path(store_path)
         self.store_path.mkdir(parents=True, exist_ok=True)
         
@@ -36,10 +165,44 @@ class FinancialKnowledgeStore:
         self.documents = []
         self.metadata = []
         
+        # Set while self.index is a read-only memory map of this file
+        self._mapped_index_file = None
+        
+        # HNSW index parameters
+        self.hnsw_m = 32
+        self.hnsw_ef_construction = 200
+        self.hnsw_ef_search = 64
+        
+        # Large corpora use a trained IVF-PQ index (compressed codes, nprobe lists per query),
+        # with an OPQ rotation and finer codes beyond opq_threshold documents
+        self.ivf_pq_threshold = 10000
+        self.opq_threshold = 50000
+        self.ivf_nprobe = 16
+        
+        # Explicit faiss index_factory string, overriding the size-based choice
+        self.index_spec = index_spec
+        
+        # Query embeddings are reused across analyses and tickers
+        self.query_cache_size = 4096
+        self._query_embeddings = OrderedDict()
+        
+        # Search results per (query, top_k), dropped whenever the corpus changes
+        self.result_cache_size = 1024
+        self.result_cache_ttl = 3600
+        self._search_results = OrderedDict()
+        self._search_lock = threading.RLock()
+        self.search_cache_stats = {'hits': 0, 'misses': 0}
+        
+        # Keyword fallback: lowercased word sets per document
+        self._doc_tokens = []
+        self._doc_sizes = np.zeros(0, dtype=np.int64)
+        
         # Initialize components if available
+        self.encoder_name = 'all-MiniLM-L6-v2'
         if SENTENCE_TRANSFORMERS_AVAILABLE:
-            self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
-            print("[OK] Sentence transformer loaded")
+            # "onnx" prefers the int8 ONNX encoder on CPU, "torch" always uses the regular model
+            # encoder_precision (one of ENCODER_PRECISIONS) applies to the torch model only
+            self.encoder = get_encoder(self.encoder_name, encoder_backend, encoder_precision)
         else:
             print("[WARN] Using basic text matching instead of vector search")
         
@@ -52,16 +215,27 @@ class FinancialKnowledgeStore:
         
         try:
             if docs_file.exists():
-                with open(docs_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.documents = data.get('documents', [])
-                    self.metadata = data.get('metadata', [])
+                data = load_json(docs_file)
+                self.documents = data.get('documents', [])
+                self._doc_tokens = []
+                self._doc_sizes = np.zeros(0, dtype=np.int64)
+                self.metadata = data.get('metadata', [])
+                self.index_spec = self.index_spec or data.get('index_spec')
                 
                 print(f"[OK] Loaded {len(self.documents)} documents from knowledge base")
             
             if FAISS_AVAILABLE and index_file.exists() and self.encoder:
-                self.index = faiss.read_index(str(index_file))
+                self.index = self._read_index(index_file)
+            if self.index is not None and self.index.metric_type != faiss.METRIC_INNER_PRODUCT:
+                # Saved by an older version with L2 distances
+                self.index = None
+                self._mapped_index_file = None
+            if self.index is not None:
+                self._configure_loaded_index(self.index)
                 print("[OK] FAISS index loaded")
+            elif FAISS_AVAILABLE and self.documents and self.encoder:
+                # No saved index: rebuild from the cached embedding matrix
+                self._rebuild_index()
                 
         except Exception as e:
             print(f"[WARN] Could not load existing knowledge base: {e}")
@@ -102,140 +276,334 @@ class FinancialKnowledgeStore:
             }
         ]
         
-        for item in default_knowledge:
-            self.add_document(
-                content=item["content"],
-                metadata={
+        # Seed the store with a single batched encode and index insert
+        created = datetime.now().isoformat()
+        self.add_documents(
+            [item["content"] for item in default_knowledge],
+            [
+                {
                     "category": item["category"],
                     "importance": item["importance"],
                     "source": "default_knowledge",
-                    "created": datetime.now().isoformat()
+                    "created": created
                 }
-            )
+                for item in default_knowledge
+            ]
+        )
         
         print(f"[OK] Created default knowledge base with {len(default_knowledge)} documents")
     
     def add_document(self, content: str, metadata: Dict[str, Any] = None):
         """Add document to knowledge store"""
-        if metadata is None:
-            metadata = {}
-        
-        metadata.update({
-            "added_at": datetime.now().isoformat(),
-            "doc_id": len(self.documents)
-        })
+        self.add_documents([content], [metadata])
+    
+    def add_documents(self, contents: List[str], metadatas: List[Optional[Dict[str, Any]]] = None):
+        """Add several documents, encoding only the new ones in a single batch"""
+        if metadatas is None:
+            metadatas = [None] * len(contents)
         
-        self.documents.append(content)
-        self.metadata.append(metadata)
+        added_at = datetime.now().isoformat()
+        for content, metadata in zip(contents, metadatas):
+            if metadata is None:
+                metadata = {}
+            metadata.update({
+                "added_at": added_at,
+                "doc_id": len(self.documents)
+            })
+            self.documents.append(content)
+            self.metadata.append(metadata)
         
-        # Update vector index if available
-        if self.encoder and FAISS_AVAILABLE:
+        # Append the new vectors to the index instead of rebuilding it
+        if self.encoder and FAISS_AVAILABLE and contents:
+            self._append_to_index(contents)
+        self.clear_search_cache()
+    
+    def _read_index(self, index_file: Path):
+        """Memory-map a saved index so it is paged in on demand, reading it fully if that fails"""
+        try:
+            index = faiss.read_index(str(index_file), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            self._mapped_index_file = index_file
+            return index
+        except RuntimeError:
+            self._mapped_index_file = None
+            return faiss.read_index(str(index_file))
+    
+    def _configure_loaded_index(self, index):
+        """Apply the search-time parameters to an index read from disk"""
+        if hasattr(index, 'hnsw'):
+            index.hnsw.efSearch = self.hnsw_ef_search
+        self._set_nprobe(index)
+        return index
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts to normalized embeddings without tracking gradients"""
+        with torch.inference_mode() if TORCH_AVAILABLE else contextlib.nullcontext():
+            return self.encoder.encode(texts, batch_size=32, show_progress_bar=False, convert_to_numpy=True, normalize_embeddings=True)
+    
+    def _append_to_index(self, contents: List[str]):
+        """Encode new documents and add them to the existing index (created on first use)"""
+        try:
+            embeddings = np.asarray(
+                self._encode(contents),
+                dtype='float32'
+            )
+            if self.index is None:
+                self.index = self._create_index(embeddings.shape[1])
+            elif self._mapped_index_file is not None:
+                # Memory-mapped indexes are read-only, load a private copy before adding
+                self.index = self._configure_loaded_index(faiss.read_index(str(self._mapped_index_file)))
+                self._mapped_index_file = None
+            self.index.add(embeddings)
+        except Exception as e:
+            print(f"[WARN] Could not index new documents, rebuilding: {e}")
             self._rebuild_index()
     
     def _rebuild_index(self):
-        """Rebuild FAISS index with current documents"""
+        """Rebuild FAISS index from all documents (used when no saved index is usable)"""
         if not self.documents or not self.encoder:
             return
         
         try:
-            # Encode all documents
-            embeddings = self.encoder.encode(self.documents)
+            # Encode all documents (or reuse the cached matrix)
+            embeddings = self._load_or_encode_documents()
             
             # Create FAISS index
             dimension = embeddings.shape[1]
             if FAISS_AVAILABLE:
-                self.index = faiss.IndexFlatL2(dimension)
-                self.index.add(embeddings.astype('float32'))
+                embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+                self.index = self._create_index(dimension, embeddings)
+                self._mapped_index_file = None
+                self.index.add(embeddings)
+                self.clear_search_cache()
                 print(f"[OK] FAISS index rebuilt with {len(self.documents)} documents")
             
         except Exception as e:
             print(f"[WARN] Could not rebuild index: {e}")
     
+    def _corpus_digest(self) -> str:
+        """Hash the corpus and encoder so cached embeddings invalidate automatically"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{self.encoder_name}:{getattr(self.encoder, 'backend', 'torch')}:"
+            f"{getattr(self.encoder, 'precision', 'fp32')}:normalized".encode('utf-8')
+        )
+        for document in self.documents:
+            digest.update(b"\x00")
+            digest.update(document.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _load_or_encode_documents(self) -> np.ndarray:
+        """Memory-map the cached corpus embeddings, encoding only when the corpus changed"""
+        embeddings_file = self.store_path / "rag_embeddings.npy"
+        digest_file = self.store_path / "rag_embeddings.digest"
+        digest = self._corpus_digest()
+        
+        if embeddings_file.exists() and digest_file.exists() and digest_file.read_text().strip() == digest:
+            return np.load(embeddings_file, mmap_mode='r')
+        
+        embeddings = np.asarray(self._encode(self.documents), dtype='float32')
+        
+        try:
+            np.save(embeddings_file, embeddings)
+            digest_file.write_text(digest)
+        except Exception as e:
+            print(f"[WARN] Could not cache document embeddings: {e}")
+        
+        return embeddings
+    
+    def _index_factory_spec(self, dimension: int, size: int) -> str:
+        """Pick the faiss index_factory string for a corpus of the given size"""
+        if self.index_spec:
+            return self.index_spec
+        nlist = max(1, int(4 * np.sqrt(size)))
+        if size > self.opq_threshold and dimension % 4 == 0:
+            return f"OPQ{dimension // 4}_{dimension},IVF{nlist},PQ{dimension // 4}x8"
+        if size > self.ivf_pq_threshold and dimension % 8 == 0:
+            return f"IVF{nlist},PQ{dimension // 8}x8"
+        # Vectors are stored as fp16 (normalized embeddings are well within range)
+        return f"HNSW{self.hnsw_m},SQfp16"
+    
+    def _create_index(self, dimension: int, training: Optional[np.ndarray] = None):
+        """Create the vector index, training it on the embeddings when it needs it
+        
+        Small stores use an HNSW graph so lookups stay sublinear as they grow;
+        rebuilding a large corpus switches to IVF-PQ to bound memory. Indexes
+        that need training fall back to HNSW when no embeddings are given.
+        """
+        size = len(training) if training is not None else 0
+        index = faiss.index_factory(dimension, self._index_factory_spec(dimension, size), faiss.METRIC_INNER_PRODUCT)
+        if not index.is_trained:
+            if training is None:
+                index = faiss.index_factory(dimension, f"HNSW{self.hnsw_m},SQfp16", faiss.METRIC_INNER_PRODUCT)
+            else:
+                index.train(training)
+        
+        if hasattr(index, 'hnsw'):
+            index.hnsw.efConstruction = self.hnsw_ef_construction
+            index.hnsw.efSearch = self.hnsw_ef_search
+        self._set_nprobe(index)
+        return index
+    
+    def _set_nprobe(self, index):
+        """Apply ivf_nprobe to an IVF index, including one wrapped in an OPQ transform"""
+        try:
+            faiss.extract_index_ivf(index).nprobe = self.ivf_nprobe
+        except (RuntimeError, AttributeError):
+            pass
+    
     def search(self, query: str, top_k: int = 3) -> List[Dict[str, Any]]:
         """Search for relevant documents"""
+        return self.search_many([query], top_k)[0]
+    
+    def search_many(self, queries: List[str], top_k: int = 3) -> List[List[Dict[str, Any]]]:
+        """Search for relevant documents for several queries at once (answers are cached)"""
         if not self.documents:
-            return []
+            return [[] for _ in queries]
         
-        # Vector search if available
-        if self.encoder and self.index and FAISS_AVAILABLE:
-            return self._vector_search(query, top_k)
-        else:
-            return self._keyword_search(query, top_k)
+        results = {}
+        now = time.monotonic()
+        with self._search_lock:
+            for query in queries:
+                entry = self._search_results.get((query, top_k))
+                if entry and now - entry[0] < self.result_cache_ttl:
+                    self._search_results.move_to_end((query, top_k))
+                    results[query] = entry[1]
+                    self.search_cache_stats['hits'] += 1
+        
+        missing = [query for query in dict.fromkeys(queries) if query not in results]
+        if missing:
+            # Vector search if available
+            if self.encoder and self.index and FAISS_AVAILABLE:
+                found = self._vector_search(missing, top_k)
+            else:
+                found = [self._keyword_search(query, top_k) for query in missing]
+            
+            with self._search_lock:
+                for query, query_results in zip(missing, found):
+                    results[query] = query_results
+                    self._search_results[(query, top_k)] = (now, query_results)
+                    self.search_cache_stats['misses'] += 1
+                while len(self._search_results) > self.result_cache_size:
+                    self._search_results.popitem(last=False)
+        
+        return [list(results[query]) for query in queries]
     
-    def _vector_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
-        """Perform vector similarity search"""
+    def clear_search_cache(self):
+        """Forget cached search results (called when documents are added)"""
+        with self._search_lock:
+            self._search_results.clear()
+    
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Encode queries in one batch, reusing cached (normalized float32) embeddings"""
+        with self._search_lock:
+            embeddings = {q: self._query_embeddings[q] for q in queries if q in self._query_embeddings}
+        missing = [q for q in dict.fromkeys(queries) if q not in embeddings]
+        
+        if missing:
+            encoded = np.asarray(self._encode(missing), dtype='float32')
+            embeddings.update(zip(missing, encoded))
+        
+        # Other threads may search concurrently, so the LRU is only touched under the lock
+        with self._search_lock:
+            for query in queries:
+                self._query_embeddings[query] = embeddings[query]
+                self._query_embeddings.move_to_end(query)
+            while len(self._query_embeddings) > self.query_cache_size:
+                self._query_embeddings.popitem(last=False)
+        
+        return np.stack([embeddings[query] for query in queries])
+    
+    def _vector_search(self, queries: List[str], top_k: int) -> List[List[Dict[str, Any]]]:
+        """Perform vector similarity search for a batch of queries"""
         try:
-            # Encode query
-            query_embedding = self.encoder.encode([query])
+            # Encode queries
+            query_embeddings = self._encode_queries(queries)
             
-            # Search
-            distances, indices = self.index.search(query_embedding.astype('float32'), top_k)
+            # Search all queries in a single call
+            scores, indices = self.index.search(query_embeddings, top_k)
             
-            results = []
-            for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-                if idx < len(self.documents):
-                    results.append({
-                        "content": self.documents[idx],
-                        "metadata": self.metadata[idx],
-                        "similarity": float(1 / (1 + distance)),  # Convert distance to similarity
-                        "rank": i + 1
-                    })
+            all_results = []
+            for query_scores, query_indices in zip(scores, indices):
+                results = []
+                for i, (score, idx) in enumerate(zip(query_scores, query_indices)):
+                    if 0 <= idx < len(self.documents):
+                        results.append({
+                            "content": self.documents[idx],
+                            "metadata": self.metadata[idx],
+                            "similarity": float(score),  # Cosine similarity of normalized embeddings
+                            "rank": i + 1
+                        })
+                all_results.append(results)
             
-            return results
+            return all_results
             
         except Exception as e:
             print(f"[WARN] Vector search failed: {e}")
-            return self._keyword_search(query, top_k)
+            return [self._keyword_search(query, top_k) for query in queries]
     
     def _keyword_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
-        """Fallback keyword-based search"""
-        query_words = set(query.lower().split())
+        """Fallback keyword-based search (Jaccard overlap of lowercased words)"""
+        query_words = frozenset(query.lower().split())
+        doc_tokens, doc_sizes = self._document_tokens()
         
-        results = []
-        for i, doc in enumerate(self.documents):
-            doc_words = set(doc.lower().split())
-            overlap = len(query_words.intersection(doc_words))
-            
-            if overlap > 0:
-                similarity = overlap / len(query_words.union(doc_words))
-                results.append({
-                    "content": doc,
-                    "metadata": self.metadata[i],
-                    "similarity": similarity,
-                    "rank": 0
-                })
-        
-        # Sort by similarity and return top_k
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-        for i, result in enumerate(results[:top_k]):
-            result["rank"] = i + 1
-        
-        return results[:top_k]
-    
-    def get_context_for_analysis(self, analysis_type: str, company_data: Dict[str, Any] = None) -> str:
-        """Get relevant context for specific analysis type"""
-        # Construct search query based on analysis type and company data
-        queries = {
-            "cash_flow": f"cash flow analysis revenue R&D spending {company_data.get('sector', '') if company_data else ''}",
-            "profit": f"profit margins profitability financial ratios {company_data.get('industry', '') if company_data else ''}",
-            "ceo": f"CEO leadership analysis executive assessment {company_data.get('ceo_name', '') if company_data else ''}",
-            "technology": f"technology analysis patents competitive advantage innovation {company_data.get('sector', '') if company_data else ''}",
-            "sentiment": f"sentiment analysis market perception social media news {company_data.get('ticker', '') if company_data else ''}",
-            "investment": f"investment recommendation framework analysis methodology {company_data.get('sector', '') if company_data else ''}"
-        }
+        overlaps = np.fromiter((len(query_words & tokens) for tokens in doc_tokens), dtype=np.int64, count=len(doc_tokens))
+        candidates = np.flatnonzero(overlaps)
+        if not len(candidates):
+            return []
         
-        query = queries.get(analysis_type, f"{analysis_type} analysis")
-        results = self.search(query, top_k=2)
+        scores = overlaps[candidates] / (len(query_words) + doc_sizes[candidates] - overlaps[candidates])
         
-        if not results:
-            return ""
+        # Keep everything tied with the k-th best score, then order stably (ties by document order)
+        if len(candidates) > top_k:
+            kth_score = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+            keep = scores >= kth_score
+            candidates, scores = candidates[keep], scores[keep]
+        order = np.argsort(-scores, kind='stable')[:top_k]
         
-        # Combine relevant context
-        context_parts = []
-        for result in results:
-            context_parts.append(f"[Knowledge] {result['content']}")
+        return [
+            {
+                "content": self.documents[candidates[i]],
+                "metadata": self.metadata[candidates[i]],
+                "similarity": float(scores[i]),
+                "rank": rank
+            }
+            for rank, i in enumerate(order, start=1)
+        ]
+    
+    def _document_tokens(self):
+        """Word sets and their sizes per document, tokenized once as documents are added"""
+        with self._search_lock:
+            new_tokens = [frozenset(document.lower().split()) for document in self.documents[len(self._doc_tokens):]]
+            if new_tokens:
+                self._doc_tokens.extend(new_tokens)
+                self._doc_sizes = np.concatenate(
+                    (self._doc_sizes, np.fromiter(map(len, new_tokens), dtype=np.int64, count=len(new_tokens)))
+                )
+            return self._doc_tokens[:], self._doc_sizes
+    
+    def _build_query(self, analysis_type: str, company_data: Dict[str, Any] = None) -> str:
+        """Construct search query based on analysis type and company data"""
+        template = QUERY_TEMPLATES.get(analysis_type)
+        field = template[1] if template else None
+        return _render_query(analysis_type, str(company_data.get(field, '')) if company_data and field else '')
+    
+    def _format_context(self, results: List[Dict[str, Any]]) -> str:
+        """Combine relevant context"""
+        return "\n".join(f"[Knowledge] {result['content']}" for result in results)
+    
+    def get_context_for_analysis(self, analysis_type: str, company_data: Dict[str, Any] = None) -> str:
+        """Get relevant context for specific analysis type"""
+        return self.get_contexts_for_analyses([analysis_type], company_data)[analysis_type]
+    
+    def get_contexts_for_analyses(self, analysis_types: List[str], company_data: Dict[str, Any] = None) -> Dict[str, str]:
+        """Get relevant context for several analysis types with one batched search"""
+        queries = [self._build_query(analysis_type, company_data) for analysis_type in analysis_types]
+        results = self.search_many(queries, top_k=2)
         
-        return "\n".join(context_parts)
+        return {
+            analysis_type: self._format_context(type_results)
+            for analysis_type, type_results in zip(analysis_types, results)
+        }
     
     def save(self):
         """Save knowledge store to disk"""
@@ -245,14 +613,15 @@ class FinancialKnowledgeStore:
             data = {
                 "documents": self.documents,
                 "metadata": self.metadata,
+                "index_spec": self.index_spec,
                 "saved_at": datetime.now().isoformat()
             }
             
-            with open(docs_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            dump_json(data, docs_file)
             
             # Save FAISS index
-            if self.index and FAISS_AVAILABLE:
+            # A memory-mapped index is unchanged since loading (and backed by the file itself)
+            if self.index and FAISS_AVAILABLE and self._mapped_index_file is None:
                 index_file = self.store_path / "faiss_index.bin"
                 faiss.write_index(self.index, str(index_file))
             
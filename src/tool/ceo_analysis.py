@@ -1,10 +1,18 @@
-import requests
-from bs4 import BeautifulSoup
-import yfinance as yf
 from typing import Dict, Any, List
 # from googlesearch import search  # Will fallback to SERP API
 import time
-from src.config import SERPAPI_API_KEY
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.config import SERPAPI_API_KEY, http_client
+from src.utils.stage_cache import cached_stage
+from src.utils.web_text import fetch_page_text
+from src.utils.yf_session import get_ticker
+
+
+# Keywords counted (once each) in the CEO background texts; each `in` check is a
+# C-level substring search, which beats a combined regex pass for lists this short
+TECH_KEYWORDS = ('engineer', 'technical', 'computer science', 'technology', 'programming', 'software')
+LEADERSHIP_KEYWORDS = ('innovative', 'visionary', 'strategic', 'collaborative', 'decisive', 'transformative')
+INNOVATION_KEYWORDS = ('innovation', 'research', 'development', 'future', 'ai', 'technology', 'disruption')
 
 
 class CEOAnalyzer:
@@ -16,7 +24,7 @@ class CEOAnalyzer:
     def get_company_leadership(self, ticker: str) -> Dict[str, Any]:
         """Get basic company and CEO information"""
         try:
-            stock = yf.Ticker(ticker)
+            stock = get_ticker(ticker)
             info = stock.info
             
             leadership_info = {
@@ -51,33 +59,50 @@ class CEOAnalyzer:
                 'public_statements': []
             }
             
-            for query in search_queries:
-                try:
-                    if self.serp_api_key:
-                        search_results = self.search_with_serper(query)
-                    else:
-                        continue  # Skip if no search API available
-                    
-                    for result in search_results:
-                        content = self.scrape_content(result.get('link', ''))
-                        if content:
-                            if 'education' in query:
-                                ceo_background['education'].append(content[:500])
-                            elif 'leadership style' in query:
-                                ceo_background['leadership_style'].append(content[:500])
-                            elif 'technical background' in query:
-                                ceo_background['technical_background'].append(content[:500])
-                            elif 'interviews' in query:
-                                ceo_background['public_statements'].append(content[:500])
-                except Exception as e:
-                    print(f"Search error for query '{query}': {e}")
-                    continue
+            if not self.serp_api_key:
+                return ceo_background  # Skip if no search API available
+            
+            # Run the searches side by side and start scraping each result set as it arrives
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                search_futures = {executor.submit(self.search_with_serper, query): query for query in search_queries}
+                scrape_futures = {}
+                for search_future in as_completed(search_futures):
+                    query = search_futures[search_future]
+                    try:
+                        search_results = search_future.result()
+                    except Exception as e:
+                        print(f"Search error for query '{query}': {e}")
+                        continue
+                    scrape_futures[query] = [
+                        executor.submit(self.scrape_content, result.get('link', ''))
+                        for result in search_results
+                    ]
+                
+                # Collect in query and result order so the output is deterministic
+                for query in search_queries:
+                    category = self._background_category(query)
+                    for scrape_future in scrape_futures.get(query, []):
+                        content = scrape_future.result()
+                        if content and category:
+                            ceo_background[category].append(content[:500])
             
             return ceo_background
             
         except Exception as e:
             return {'error': f"Failed to search CEO background: {str(e)}"}
     
+    def _background_category(self, query: str) -> str:
+        """Map a background search query to the ceo_background list it fills"""
+        if 'education' in query:
+            return 'education'
+        elif 'leadership style' in query:
+            return 'leadership_style'
+        elif 'technical background' in query:
+            return 'technical_background'
+        elif 'interviews' in query:
+            return 'public_statements'
+        return ''
+    
     def search_with_serper(self, query: str) -> List[Dict[str, Any]]:
         """Search using Serper API"""
         try:
@@ -93,7 +118,7 @@ class CEOAnalyzer:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = http_client.post(url, json=payload, headers=headers)
             data = response.json()
             
             results = []
@@ -114,23 +139,7 @@ class CEOAnalyzer:
     def scrape_content(self, url: str) -> str:
         """Scrape content from a URL"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove scripts and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return text[:1000]  # Limit to first 1000 characters
-            
+            return fetch_page_text(url, max_chars=1000)  # Limit to first 1000 characters
         except Exception:
             return ""
     
@@ -148,24 +157,19 @@ class CEOAnalyzer:
             }
             
             # Analyze technical background
-            tech_keywords = ['engineer', 'technical', 'computer science', 'technology', 'programming', 'software']
             tech_content = ' '.join(ceo_background.get('technical_background', [])).lower()
-            tech_score = sum(1 for keyword in tech_keywords if keyword in tech_content)
+            tech_score = sum(1 for keyword in TECH_KEYWORDS if keyword in tech_content)
             leadership_analysis['technical_competency'] = min(tech_score * 2, 10)
             
             # Analyze leadership style
-            leadership_keywords = ['innovative', 'visionary', 'strategic', 'collaborative', 'decisive', 'transformative']
             leadership_content = ' '.join(ceo_background.get('leadership_style', [])).lower()
-            leadership_score = sum(1 for keyword in leadership_keywords if keyword in leadership_content)
+            leadership_score = sum(1 for keyword in LEADERSHIP_KEYWORDS if keyword in leadership_content)
             leadership_analysis['leadership_effectiveness'] = min(leadership_score * 1.5, 10)
             
-            # Innovation focus analysis
-            innovation_keywords = ['innovation', 'research', 'development', 'future', 'ai', 'technology', 'disruption']
-            all_content = ' '.join([
-                ' '.join(ceo_background.get('leadership_style', [])),
-                ' '.join(ceo_background.get('public_statements', []))
-            ]).lower()
-            innovation_score = sum(1 for keyword in innovation_keywords if keyword in all_content)
+            # Innovation focus analysis (leadership text is already joined and lowercased)
+            statements_content = ' '.join(ceo_background.get('public_statements', [])).lower()
+            all_content = f"{leadership_content} {statements_content}"
+            innovation_score = sum(1 for keyword in INNOVATION_KEYWORDS if keyword in all_content)
             leadership_analysis['innovation_focus'] = min(innovation_score * 1.2, 10)
             
             # Calculate overall future impact score
@@ -191,6 +195,7 @@ class CEOAnalyzer:
         except Exception as e:
             return {'error': f"Failed to analyze leadership impact: {str(e)}"}
     
+    @cached_stage('ceo')
     def analyze_ceo_complete(self, ticker: str) -> Dict[str, Any]:
         """Complete CEO analysis including background and leadership impact"""
         try:
@@ -1,66 +1,172 @@
-import yfinance as yf
-import requests
+import logging
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
-import json
+from typing import Dict, Any, List, Optional, Tuple
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.stage_cache import StageCache, cached_stage
+from src.utils.yf_session import get_ticker
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched data set is reused, so ticker validation and the cash flow
+# and profit stages of one analysis share a single yfinance download
+FINANCIAL_DATA_TTL = 900
+# Tickers whose downloads are kept in memory (least recently used are dropped first)
+FINANCIAL_DATA_MEMORY_ENTRIES = 32
+
+# Stand-in for a statement missing from hand-built financial_data dicts
+EMPTY_STATEMENT = pd.DataFrame()
+
+# Line item names used by yfinance (and older statement layouts), most common first
+RD_ROW_LABELS = ('Research And Development', 'Research Development', 'R&D Expenses')
+REVENUE_ROW_LABELS = ('Total Revenue', 'Revenue')
+
+# Average R&D-to-revenue ratio (%) above each threshold earns the next future focus score
+FUTURE_FOCUS_THRESHOLDS = (5, 10, 15)
+FUTURE_FOCUS_SCORES = (3, 5, 7, 9)
+
+# yfinance info keys read by the analyzers and the workflow (RAG queries, company name);
+# info carries a few hundred keys, the rest are dropped before the data is cached
+COMPANY_INFO_FIELDS = (
+    'longName', 'shortName', 'sector', 'industry', 'longBusinessSummary', 'marketCap',
+    'returnOnEquity', 'returnOnAssets', 'grossMargins', 'operatingMargins', 'profitMargins'
+)
+
+_financial_data_cache = OrderedDict()
+# Downloads persisted across runs for a day (forced re-runs skip the lookup)
+financial_data_store = StageCache("~/.cache/ai-ticker/financial", ttl_days=1, max_memory_entries=64)
+_fetch_locks = defaultdict(threading.Lock)
+_fetch_locks_guard = threading.Lock()
+
+
+def get_financial_data(ticker: str) -> Dict[str, Any]:
+    """Get comprehensive financial data for a company (in memory for FINANCIAL_DATA_TTL seconds, on disk for a day)"""
+    key = ticker.upper()
+    with _fetch_locks_guard:
+        lock = _fetch_locks[key]
+    
+    # Stages running concurrently for the same ticker wait for one download
+    with lock:
+        # A forced re-run (--force-new) only reuses downloads made since it started
+        refresh_started = financial_data_store.refresh_started()
+        with _fetch_locks_guard:
+            cached = _financial_data_cache.get(key)
+            if cached and time.monotonic() - cached[0] < FINANCIAL_DATA_TTL and (refresh_started is None or cached[0] >= refresh_started):
+                _financial_data_cache.move_to_end(key)
+                return cached[1]
+        
+        # Statements only change quarterly, so earlier runs' downloads are reused from disk
+        entry = financial_data_store.get(key, 'financial_data')
+        if entry is not None:
+            logger.info("   [CACHE] Reusing %s financial data from %s", key, entry['stored_at'])
+            financial_data = entry['result']
+        else:
+            financial_data = _fetch_financial_data(ticker)
+            if 'error' not in financial_data:
+                financial_data_store.set(key, 'financial_data', financial_data)
+        
+        if 'error' not in financial_data:
+            with _fetch_locks_guard:
+                _financial_data_cache[key] = (time.monotonic(), financial_data)
+                _financial_data_cache.move_to_end(key)
+                while len(_financial_data_cache) > FINANCIAL_DATA_MEMORY_ENTRIES:
+                    _financial_data_cache.popitem(last=False)
+        return financial_data
+
+
+def _fetch_financial_data(ticker: str) -> Dict[str, Any]:
+    """Download financial statements and company info from yfinance"""
+    try:
+        stock = get_ticker(ticker)
+    
+        # Get basic info first to validate ticker
+        info = stock.info
+    
+        # Validate that we got actual company data
+        if not info or len(info) < 10:
+            return {'error': f"Invalid ticker '{ticker}' - no company information found"}
+    
+        # Check for essential company fields
+        company_name = info.get('longName') or info.get('shortName')
+        if not company_name:
+            return {'error': f"Invalid ticker '{ticker}' - no company name found"}
+    
+        print(f"   [OK] Found company: {company_name}")
+    
+        # Get financial statements
+        income_stmt = _numeric_statement(stock.financials)
+        balance_sheet = _numeric_statement(stock.balance_sheet)
+        cash_flow = _numeric_statement(stock.cashflow)
+    
+        # Validate that we have at least some financial data
+        has_financial_data = (
+            not income_stmt.empty or 
+            not balance_sheet.empty or 
+            not cash_flow.empty
+        )
+    
+        if not has_financial_data:
+            return {'error': f"No financial data available for '{ticker}'"}
+    
+        print(f"   [OK] Financial data retrieved successfully")
+    
+        # Statements stay DataFrames (rows = line items, columns = period end dates)
+        return {
+            'income_statement': income_stmt,
+            'balance_sheet': balance_sheet,
+            'cash_flow': cash_flow,
+            'company_info': {field: info[field] for field in COMPANY_INFO_FIELDS if field in info},
+            'ticker': ticker
+        }
+    except Exception as e:
+        return {'error': f"Failed to fetch financial data for '{ticker}': {str(e)}"}
+
+
+def _numeric_statement(statement: pd.DataFrame) -> pd.DataFrame:
+    """Statement as one float64 block (yfinance can return object columns holding None)
+    
+    Boxed object cells take several times the memory of a float64 block in the
+    download cache; converted once here, the margin and ratio arithmetic
+    downstream also stays on native floats.
+    """
+    if (statement.dtypes == 'float64').all():
+        return statement
+    return statement.apply(pd.to_numeric, errors='coerce').astype('float64')
+
+
+def _statement_row(statement: pd.DataFrame, labels: Tuple[str, ...]) -> Optional[pd.Series]:
+    """First row of the statement found under one of the labels (in preference order)"""
+    label = next((label for label in labels if label in statement.index), None)
+    return statement.loc[label] if label is not None else None
+
+
+def _rd_ratios(rd: np.ndarray, revenue: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """R&D as a percentage of revenue, plus the mask of periods it is defined for
+    
+    Plain ndarray arithmetic: statements have a handful of periods, where the
+    fixed per-call cost of pandas alignment and masking dominates.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = rd / np.where(revenue != 0, revenue, np.nan) * 100
+    reported = ~np.isnan(ratios)
+    return ratios[reported], reported
 
 
 class CashFlowAnalyzer:
     """Analyzes company cash flow focusing on revenue streams and R&D investment"""
     
-    def __init__(self):
-        pass
-    
     def get_financial_data(self, ticker: str) -> Dict[str, Any]:
         """Get comprehensive financial data for a company"""
-        try:
-            stock = yf.Ticker(ticker)
-            
-            # Get basic info first to validate ticker
-            info = stock.info
-            
-            # Validate that we got actual company data
-            if not info or len(info) < 10:
-                return {'error': f"Invalid ticker '{ticker}' - no company information found"}
-            
-            # Check for essential company fields
-            company_name = info.get('longName') or info.get('shortName')
-            if not company_name:
-                return {'error': f"Invalid ticker '{ticker}' - no company name found"}
-            
-            print(f"   [OK] Found company: {company_name}")
-            
-            # Get financial statements
-            income_stmt = stock.financials
-            balance_sheet = stock.balance_sheet
-            cash_flow = stock.cashflow
-            
-            # Validate that we have at least some financial data
-            has_financial_data = (
-                not income_stmt.empty or 
-                not balance_sheet.empty or 
-                not cash_flow.empty
-            )
-            
-            if not has_financial_data:
-                return {'error': f"No financial data available for '{ticker}'"}
-            
-            print(f"   [OK] Financial data retrieved successfully")
-            
-            return {
-                'income_statement': income_stmt.to_dict() if not income_stmt.empty else {},
-                'balance_sheet': balance_sheet.to_dict() if not balance_sheet.empty else {},
-                'cash_flow': cash_flow.to_dict() if not cash_flow.empty else {},
-                'company_info': info,
-                'ticker': ticker
-            }
-        except Exception as e:
-            return {'error': f"Failed to fetch financial data for '{ticker}': {str(e)}"}
+        return get_financial_data(ticker)
     
     def analyze_revenue_streams(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze how the company makes money"""
         try:
-            income_stmt = financial_data.get('income_statement', {})
+            income_stmt = financial_data.get('income_statement', EMPTY_STATEMENT)
             company_info = financial_data.get('company_info', {})
             
             # Extract revenue data
@@ -74,14 +180,12 @@ class CashFlowAnalyzer:
             }
             
             # Calculate revenue metrics
-            if 'Total Revenue' in income_stmt:
-                revenue_data = income_stmt['Total Revenue']
-                revenue_analysis['total_revenue'] = {
-                    str(date): value for date, value in revenue_data.items()
-                }
+            if 'Total Revenue' in income_stmt.index:
+                revenue_data = income_stmt.loc['Total Revenue']
+                revenue_values = revenue_data.tolist()
+                revenue_analysis['total_revenue'] = dict(zip(map(str, revenue_data.index), revenue_values))
                 
                 # Calculate growth rates
-                revenue_values = list(revenue_data.values())
                 if len(revenue_values) >= 2:
                     recent_growth = (revenue_values[0] - revenue_values[1]) / revenue_values[1] * 100
                     revenue_analysis['revenue_growth']['yoy_growth'] = recent_growth
@@ -94,8 +198,7 @@ class CashFlowAnalyzer:
     def calculate_rd_ratio(self, financial_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate R&D investment ratio and trends"""
         try:
-            income_stmt = financial_data.get('income_statement', {})
-            cash_flow = financial_data.get('cash_flow', {})
+            income_stmt = financial_data.get('income_statement', EMPTY_STATEMENT)
             
             rd_analysis = {
                 'rd_expenses': {},
@@ -105,56 +208,34 @@ class CashFlowAnalyzer:
             }
             
             # Get R&D expenses
-            rd_keys = ['Research And Development', 'Research Development', 'R&D Expenses']
-            revenue_keys = ['Total Revenue', 'Revenue']
-            
-            rd_data = None
-            revenue_data = None
-            
-            for key in rd_keys:
-                if key in income_stmt:
-                    rd_data = income_stmt[key]
-                    break
-            
-            for key in revenue_keys:
-                if key in income_stmt:
-                    revenue_data = income_stmt[key]
-                    break
+            rd_data = _statement_row(income_stmt, RD_ROW_LABELS)
+            revenue_data = _statement_row(income_stmt, REVENUE_ROW_LABELS)
             
             if rd_data is not None and revenue_data is not None:
-                # Calculate R&D ratios
-                for date in rd_data.index:
-                    if date in revenue_data.index and revenue_data[date] != 0:
-                        rd_expense = rd_data[date]
-                        revenue = revenue_data[date]
-                        ratio = (rd_expense / revenue) * 100
-                        
-                        rd_analysis['rd_expenses'][str(date)] = rd_expense
-                        rd_analysis['rd_ratio_to_revenue'][str(date)] = ratio
+                # Calculate R&D ratios for the dates with a non-zero revenue (in R&D date order)
+                rd_values = rd_data.to_numpy(dtype='float64')
+                ratio_values, reported = _rd_ratios(rd_values, revenue_data.reindex(rd_data.index).to_numpy(dtype='float64'))
+                dates = [str(date) for date in rd_data.index[reported]]
+                
+                rd_analysis['rd_expenses'] = dict(zip(dates, rd_values[reported].tolist()))
+                rd_analysis['rd_ratio_to_revenue'] = dict(zip(dates, ratio_values.tolist()))
                 
                 # Calculate trend and future focus score
-                ratios = list(rd_analysis['rd_ratio_to_revenue'].values())
-                if len(ratios) >= 2:
-                    trend = ratios[0] - ratios[-1]  # Recent vs oldest
+                if len(ratio_values) >= 2:
+                    trend = float(ratio_values[0] - ratio_values[-1])  # Recent vs oldest
                     rd_analysis['rd_trends']['trend_direction'] = 'increasing' if trend > 0 else 'decreasing'
                     rd_analysis['rd_trends']['trend_magnitude'] = abs(trend)
                     
                     # Future focus score (higher R&D ratio = more future focused)
-                    avg_ratio = sum(ratios) / len(ratios)
-                    if avg_ratio > 15:
-                        rd_analysis['future_focus_score'] = 9
-                    elif avg_ratio > 10:
-                        rd_analysis['future_focus_score'] = 7
-                    elif avg_ratio > 5:
-                        rd_analysis['future_focus_score'] = 5
-                    else:
-                        rd_analysis['future_focus_score'] = 3
+                    avg_ratio = float(ratio_values.mean())
+                    rd_analysis['future_focus_score'] = FUTURE_FOCUS_SCORES[bisect_left(FUTURE_FOCUS_THRESHOLDS, avg_ratio)]
             
             return rd_analysis
             
         except Exception as e:
             return {'error': f"Failed to calculate R&D ratio: {str(e)}"}
     
+    @cached_stage('cash_flow')
     def analyze_cash_flow(self, ticker: str) -> Dict[str, Any]:
         """Complete cash flow analysis combining revenue streams and R&D investment"""
         financial_data = self.get_financial_data(ticker)
@@ -174,23 +255,45 @@ class CashFlowAnalyzer:
                 'sector': financial_data.get('company_info', {}).get('sector', 'N/A'),
                 'market_cap': financial_data.get('company_info', {}).get('marketCap', 'N/A'),
                 'future_focus_score': rd_analysis.get('future_focus_score', 0),
-                'analysis_date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+                'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S')
             }
         }
+    
+    def analyze_cash_flow_batch(self, tickers: List[str], max_workers: int = 16) -> Dict[str, Dict[str, Any]]:
+        """Cash flow analysis for several tickers, downloading their data concurrently"""
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        
+        # yfinance blocks on HTTP with the GIL released, so threads overlap the downloads
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+            return dict(zip(tickers, executor.map(self.analyze_cash_flow, tickers)))
 
 
 class ProfitAnalyzer:
     """Analyzes how the company generates and maintains profitability"""
     
+    # Income statement rows reported as a percentage of revenue
+    MARGIN_ROWS = {
+        'Gross Profit': 'gross_margin',
+        'Operating Income': 'operating_margin',
+        'Net Income': 'net_margin'
+    }
+    
     def __init__(self):
         pass
     
+    @cached_stage('profit')
     def analyze_profit_mechanisms(self, ticker: str) -> Dict[str, Any]:
         """Analyze profit margins, efficiency, and sustainability"""
         try:
-            stock = yf.Ticker(ticker)
-            financials = stock.financials
-            info = stock.info
+            # Same (cached) download as the cash flow stage
+            financial_data = get_financial_data(ticker)
+            if 'error' in financial_data:
+                return financial_data
+            
+            financials = financial_data['income_statement']
+            info = financial_data['company_info']
             
             profit_analysis = {
                 'profit_margins': {},
@@ -199,29 +302,16 @@ class ProfitAnalyzer:
                 'competitive_advantages': []
             }
             
-            # Calculate profit margins
-            if not financials.empty:
-                revenue = financials.loc['Total Revenue'] if 'Total Revenue' in financials.index else None
-                gross_profit = financials.loc['Gross Profit'] if 'Gross Profit' in financials.index else None
-                operating_income = financials.loc['Operating Income'] if 'Operating Income' in financials.index else None
-                net_income = financials.loc['Net Income'] if 'Net Income' in financials.index else None
+            # Calculate profit margins (all dates with a non-zero revenue in one division)
+            if 'Total Revenue' in financials.index:  # also covers an empty statement
+                revenue = financials.loc['Total Revenue']
+                reported = revenue != 0
+                rows = [row for row in self.MARGIN_ROWS if row in financials.index]
                 
-                if revenue is not None:
-                    for date in revenue.index:
-                        rev_val = revenue[date]
-                        if rev_val != 0:
-                            margins = {}
-                            
-                            if gross_profit is not None and date in gross_profit.index:
-                                margins['gross_margin'] = (gross_profit[date] / rev_val) * 100
-                            
-                            if operating_income is not None and date in operating_income.index:
-                                margins['operating_margin'] = (operating_income[date] / rev_val) * 100
-                            
-                            if net_income is not None and date in net_income.index:
-                                margins['net_margin'] = (net_income[date] / rev_val) * 100
-                            
-                            profit_analysis['profit_margins'][str(date)] = margins
+                margins = financials.loc[rows, reported].div(revenue[reported]).mul(100)
+                profit_analysis['profit_margins'] = (
+                    margins.rename(index=self.MARGIN_ROWS).T.rename(index=str).to_dict(orient='index')
+                )
             
             # Add company-specific metrics
             profit_analysis['company_metrics'] = {
@@ -1,4 +1,3 @@
-import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -9,29 +8,25 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 
+from src.utils.json_utils import dump_json, load_json
+
 
 class ReportGenerator:
     """Generates comprehensive reports and saves them in ticker-specific folders"""
     
     def __init__(self, base_reports_dir: str = "reports"):
+        # Created on the first report write (create_ticker_folder), not at construction
         self.base_reports_dir = Path(base_reports_dir)
-        self.base_reports_dir.mkdir(exist_ok=True)
     
     def create_ticker_folder(self, ticker: str, analysis_date: str = None) -> Path:
         """Create date-based folder structure for ticker reports"""
         if analysis_date is None:
             analysis_date = datetime.now().strftime("%Y-%m-%d_%H%M%S")
         
-        ticker_folder = self.base_reports_dir / ticker.upper()
-        ticker_folder.mkdir(exist_ok=True)
-        
-        # Create date-based subfolder
-        analysis_folder = ticker_folder / analysis_date
-        analysis_folder.mkdir(exist_ok=True)
-        
-        # Create subfolders within the analysis folder
-        (analysis_folder / "charts").mkdir(exist_ok=True)
-        (analysis_folder / "raw_data").mkdir(exist_ok=True)
+        # Date-based subfolder; creating the two leaf folders creates the ticker/date parents
+        analysis_folder = self.base_reports_dir / ticker.upper() / analysis_date
+        (analysis_folder / "charts").mkdir(parents=True, exist_ok=True)
+        (analysis_folder / "raw_data").mkdir(parents=True, exist_ok=True)
         
         return analysis_folder
     
@@ -95,8 +90,7 @@ class ReportGenerator:
         }
         
         metadata_file = analysis_folder / "analysis_metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, default=str)
+        dump_json(metadata, metadata_file)
         
         return str(metadata_file)
     
@@ -114,8 +108,7 @@ class ReportGenerator:
             if not metadata_file.exists():
                 return None
             
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            metadata = load_json(metadata_file)
             
             # Load raw data files
             raw_data_folder = analysis_folder / "raw_data"
@@ -124,9 +117,7 @@ class ReportGenerator:
             if raw_data_folder.exists():
                 for data_file in raw_data_folder.glob("*.json"):
                     try:
-                        with open(data_file, 'r', encoding='utf-8') as f:
-                            file_data = json.load(f)
-                        analysis_data['raw_data'][data_file.stem] = file_data
+                        analysis_data['raw_data'][data_file.stem] = load_json(data_file)
                     except Exception as e:
                         print(f"Warning: Could not load {data_file}: {e}")
             
@@ -148,8 +139,7 @@ class ReportGenerator:
         filename = f"{analysis_type}_data.json"
         filepath = analysis_folder / "raw_data" / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        dump_json(data, filepath)
         
         return str(filepath)
     
@@ -1,14 +1,15 @@
 import tweepy
-import requests
 from newsapi import NewsApiClient
 from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import yfinance as yf
 from typing import Dict, Any, List
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
-from src.config import SERPAPI_API_KEY, SERPER_API_KEY
+from src.config import SERPAPI_API_KEY, SERPER_API_KEY, http_client
+from src.utils.stage_cache import cached_stage
+from src.utils.yf_session import get_ticker
 
 
 class SentimentAnalyzer:
@@ -32,7 +33,7 @@ class SentimentAnalyzer:
     def get_company_info(self, ticker: str) -> Dict[str, Any]:
         """Get basic company information for sentiment analysis"""
         try:
-            stock = yf.Ticker(ticker)
+            stock = get_ticker(ticker)
             info = stock.info
             
             return {
@@ -141,7 +142,7 @@ class SentimentAnalyzer:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = http_client.post(url, json=payload, headers=headers)
             data = response.json()
             
             articles = []
@@ -307,6 +308,7 @@ class SentimentAnalyzer:
         except Exception as e:
             return {'error': f"Failed to combine sentiment analysis: {str(e)}"}
     
+    @cached_stage('sentiment')
     def analyze_sentiment_complete(self, ticker: str) -> Dict[str, Any]:
         """Complete sentiment analysis combining news and Twitter data"""
         try:
@@ -318,11 +320,12 @@ class SentimentAnalyzer:
             
             company_name = company_info['company_name']
             
-            # Analyze news sentiment
-            news_data = self.search_news_sentiment(company_name, ticker)
-            
-            # Analyze Twitter sentiment
-            twitter_data = self.search_twitter_sentiment(company_name, ticker)
+            # News and Twitter searches are independent, fetch them concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                news_future = executor.submit(self.search_news_sentiment, company_name, ticker)
+                twitter_future = executor.submit(self.search_twitter_sentiment, company_name, ticker)
+                news_data = news_future.result()
+                twitter_data = twitter_future.result()
             
             # Combine analyses
             combined_analysis = self.combine_sentiment_analysis(news_data, twitter_data)
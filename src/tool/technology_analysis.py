@@ -1,10 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-import yfinance as yf
 from typing import Dict, Any, List
 import time
+from concurrent.futures import ThreadPoolExecutor
 # from googlesearch import search  # Will use SERP API instead
-from src.config import SERPAPI_API_KEY, SERPER_API_KEY
+from src.config import SERPAPI_API_KEY, SERPER_API_KEY, http_client
+from src.utils.stage_cache import cached_stage
+from src.utils.web_text import fetch_page_text
+from src.utils.yf_session import get_ticker
 import json
 
 
@@ -18,7 +19,7 @@ class TechnologyAnalyzer:
     def get_company_tech_info(self, ticker: str) -> Dict[str, Any]:
         """Get basic company technology information"""
         try:
-            stock = yf.Ticker(ticker)
+            stock = get_ticker(ticker)
             info = stock.info
             
             tech_info = {
@@ -102,7 +103,7 @@ class TechnologyAnalyzer:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = http_client.post(url, json=payload, headers=headers)
             data = response.json()
             
             results = []
@@ -123,23 +124,7 @@ class TechnologyAnalyzer:
     def scrape_content(self, url: str) -> str:
         """Scrape content from a URL"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove scripts and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            text = soup.get_text()
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return text[:800]  # Limit to first 800 characters
-            
+            return fetch_page_text(url, max_chars=800)  # Limit to first 800 characters
         except Exception:
             return ""
     
@@ -282,6 +267,7 @@ class TechnologyAnalyzer:
         except Exception as e:
             return {'error': f"Failed to calculate technology score: {str(e)}"}
     
+    @cached_stage('technology')
     def analyze_technology_complete(self, ticker: str) -> Dict[str, Any]:
         """Complete technology analysis including patents, stack, and competitive position"""
         try:
@@ -294,11 +280,12 @@ class TechnologyAnalyzer:
             company_name = company_info['company_name']
             business_summary = company_info.get('business_summary', '')
             
-            # Search patent and IP information
-            patent_data = self.search_patent_information(company_name, ticker)
-            
-            # Analyze technology stack
-            tech_stack = self.analyze_technology_stack(company_name, ticker, business_summary)
+            # Patent search and technology stack search are independent, fetch them concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                patent_future = executor.submit(self.search_patent_information, company_name, ticker)
+                stack_future = executor.submit(self.analyze_technology_stack, company_name, ticker, business_summary)
+                patent_data = patent_future.result()
+                tech_stack = stack_future.result()
             
             # Calculate technology scores
             tech_scores = self.calculate_technology_score(patent_data, tech_stack, company_info)
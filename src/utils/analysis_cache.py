@@ -0,0 +1,43 @@
+"""
+Persistent memoization for comprehensive ticker analyses
+"""
+
+import hashlib
+from datetime import date, datetime
+from typing import Dict, Any, Optional
+
+from src.utils.disk_cache import PersistentLRUCache
+
+
+class AnalysisCache(PersistentLRUCache):
+    """Disk-backed analysis cache with an in-memory LRU front
+
+    Entries are keyed by (ticker, llm, date bucket) so a result is reused for
+    every call inside the same bucket and naturally expires when the bucket
+    rolls over.
+    """
+
+    name = "analysis cache"
+
+    def __init__(self, cache_dir: str = "~/.cache/ai-ticker", ttl_days: int = 15, max_memory_entries: int = 64):
+        super().__init__(cache_dir, max_memory_entries)
+        self.ttl_days = ttl_days
+
+    def make_key(self, ticker: str, llm: str) -> str:
+        """Build the cache key for a ticker/LLM pair in the current date bucket"""
+        bucket = date.today().toordinal() // self.ttl_days
+        return hashlib.sha1(f"{ticker.upper()}|{llm}|{bucket}".encode('utf-8')).hexdigest()
+
+    def get(self, ticker: str, llm: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry ({'stored_at', 'result'}) or None"""
+        return self.load(self.make_key(ticker, llm))
+
+    def set(self, ticker: str, llm: str, result: Dict[str, Any]):
+        """Store an analysis result in memory and on disk"""
+        # Store a copy: wait_for_reports() adds 'report_files' to the live result afterwards
+        entry = {'stored_at': datetime.now().isoformat(), 'result': dict(result)}
+        self.store(self.make_key(ticker, llm), entry)
+
+
+# Global instance
+analysis_cache = AnalysisCache()
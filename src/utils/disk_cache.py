@@ -0,0 +1,76 @@
+"""
+Disk-backed pickle cache with an in-memory LRU front, shared by the result caches
+"""
+
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentLRUCache:
+    """One pickle file per key under cache_dir, fronted by an in-memory LRU
+
+    Subclasses build the keys and decide when an entry is stale (is_expired);
+    entries are dicts whose layout is up to the subclass.
+    """
+
+    # Used in log messages
+    name = "cache"
+
+    def __init__(self, cache_dir: str, max_memory_entries: int):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()
+        # Analyzer stages read and write from several worker threads at once
+        self._lock = threading.Lock()
+
+    def is_expired(self, entry: Dict[str, Any]) -> bool:
+        """Whether a stored entry is too old to be served (never, by default)"""
+        return False
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for key from memory or disk, or None if missing or expired"""
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            cache_file = self.cache_dir / f"{key}.pkl"
+            if not cache_file.exists():
+                return None
+            try:
+                with open(cache_file, 'rb') as f:
+                    entry = pickle.load(f)
+            except Exception as e:
+                logger.warning("[WARN] Could not read %s %s: %s", self.name, cache_file, e)
+                return None
+
+        if self.is_expired(entry):
+            with self._lock:
+                self._memory.pop(key, None)
+            return None
+
+        self._remember(key, entry)
+        return entry
+
+    def store(self, key: str, entry: Dict[str, Any]):
+        """Keep an entry in memory and write it to disk"""
+        self._remember(key, entry)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / f"{key}.pkl", 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning("[WARN] Could not write %s: %s", self.name, e)
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
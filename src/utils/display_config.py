@@ -0,0 +1,82 @@
+"""
+Display and console configuration
+"""
+
+import logging
+import os
+import re
+import sys
+import platform
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=1)
+def _detect_env() -> Tuple[str, str, bool]:
+    """Probe (platform, stdout encoding, USE_ASCII_ONLY) once per process"""
+    return (
+        platform.system(),
+        sys.stdout.encoding or '',
+        os.getenv('USE_ASCII_ONLY', '').lower() == 'true'
+    )
+
+
+class DisplayConfig:
+    """Centralized display configuration"""
+    
+    def __init__(self):
+        self.platform, self.encoding, ascii_requested = _detect_env()
+        self.is_windows_gbk = (
+            self.platform == 'Windows' and 
+            self.encoding.lower() in ['gbk', 'cp936']
+        )
+        
+        # Load from environment or config file
+        self.use_ascii_only = ascii_requested or self.is_windows_gbk
+        
+        # Emoji to ASCII mapping, matched in one pass (longest keys first)
+        self.emoji_map = {
+            '✅': '[OK]',
+            '❌': '[FAIL]', 
+            '⚠️': '[WARN]',
+            '🚀': '[START]',
+            '📊': '[DATA]',
+            '💰': '[MONEY]',
+            '👤': '[USER]',
+            '💻': '[TECH]',
+            '📈': '[UP]',
+            '🤖': '[AI]',
+            '📄': '[DOC]',
+            '🎯': '[TARGET]',
+            '📁': '[FOLDER]',
+            '💡': '[IDEA]',
+            '🔧': '[TOOL]',
+            '⏰': '[TIME]',
+            '🎉': '[SUCCESS]',
+            '📋': '[LIST]',
+            '💥': '[ERROR]',
+            '🔍': '[SEARCH]',
+        }
+        self._emoji_pattern = re.compile(
+            '|'.join(re.escape(emoji) for emoji in sorted(self.emoji_map, key=len, reverse=True))
+        )
+    
+    def safe_text(self, text: str) -> str:
+        """Convert text to safe display format"""
+        if not self.use_ascii_only or not self._emoji_pattern.search(text):
+            return text
+        return self._emoji_pattern.sub(lambda match: self.emoji_map[match.group(0)], text)
+
+# Global instance
+display_config = DisplayConfig()
+
+# Quick function to format text safely (the bound method, no extra call frame)
+safe_format = display_config.safe_text
+
+
+class SafeTextFormatter(logging.Formatter):
+    """Log formatter applying safe_text to each record when output is ASCII-only"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        return display_config.safe_text(text) if display_config.use_ascii_only else text
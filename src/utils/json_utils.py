@@ -0,0 +1,52 @@
+"""
+JSON file helpers for analysis results, backed by orjson when it is installed
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    # Results carry numpy scalars and dicts with non-string keys
+    ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data to indented UTF-8 JSON, stringifying unknown types"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, default=str, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass  # e.g. keys of a type orjson won't stringify, retry with the stdlib encoder
+    return json.dumps(data, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def dumps_compact_json(data: Any) -> str:
+    """Serialize data to single-line JSON text without whitespace, e.g. for LLM prompts"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, separators=(',', ':'), default=str, ensure_ascii=False)
+
+
+def dump_json(data: Any, path: Union[str, Path]):
+    """Write data to a JSON file in a single write"""
+    with open(path, 'wb') as f:
+        f.write(dumps_json(data))
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Read a JSON file written by dump_json (or any other UTF-8 JSON file)"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -0,0 +1,45 @@
+"""
+Persistent exact-match cache for LLM responses
+"""
+
+import hashlib
+import time
+from typing import Dict, Any, Optional
+
+from src.utils.disk_cache import PersistentLRUCache
+
+
+class LLMResponseCache(PersistentLRUCache):
+    """Disk-backed LLM response cache with an in-memory LRU front
+
+    Responses are keyed by (llm, sha256 of the prompt) and expire after
+    ttl_hours, so identical prompts are answered without an API call.
+    """
+
+    name = "LLM cache"
+
+    def __init__(self, cache_dir: str = "~/.cache/ai-ticker/llm", ttl_hours: float = 24, max_memory_entries: int = 256):
+        super().__init__(cache_dir, max_memory_entries)
+        self.ttl_seconds = ttl_hours * 3600
+
+    def make_key(self, llm: str, prompt: str) -> str:
+        """Build the cache key for a prompt sent to the given LLM"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return hashlib.sha256(f"{llm}|{prompt_hash}".encode('utf-8')).hexdigest()
+
+    def is_expired(self, entry: Dict[str, Any]) -> bool:
+        """Responses expire ttl_hours after they were stored"""
+        return time.time() - entry['stored_at'] > self.ttl_seconds
+
+    def get(self, llm: str, prompt: str) -> Optional[str]:
+        """Return the cached response for the prompt, or None if missing or expired"""
+        entry = self.load(self.make_key(llm, prompt))
+        return entry['response'] if entry is not None else None
+
+    def set(self, llm: str, prompt: str, response: str):
+        """Store a response in memory and on disk"""
+        self.store(self.make_key(llm, prompt), {'stored_at': time.time(), 'response': response})
+
+
+# Global instance
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,149 @@
+"""
+Client-side rate limiting for LLM requests
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class LLMRateLimiter:
+    """Caps concurrent LLM requests and spaces them to a requests-per-minute budget
+
+    Staying under the provider's limits avoids 429 responses that the SDKs
+    otherwise retry with backoff. A requests_per_minute of 0 disables the
+    spacing and only the concurrency cap applies.
+
+    The cap is process-wide: blocking calls, worker threads and every event
+    loop draw from the same slots, and a released slot goes to the oldest waiter.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, requests_per_minute: float = 0):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._active = 0
+        # threading.Event (blocking callers) or (loop, future) (async callers), oldest first
+        self._waiters = deque()
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        """Requests currently queued for a slot"""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def limit(self):
+        """Hold a request slot inside an event loop"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        if not self._acquire(waiter):
+            try:
+                await future
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+        try:
+            delay = self._reserve_slot()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def limit_sync(self):
+        """Hold a request slot from a regular (possibly worker) thread"""
+        event = threading.Event()
+        if not self._acquire(event):
+            event.wait()
+        try:
+            delay = self._reserve_slot()
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            self._release()
+
+    def _acquire(self, waiter) -> bool:
+        """Take a free slot, or queue the waiter to be handed the next released one"""
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                return True
+            self._waiters.append(waiter)
+            queued = len(self._waiters)
+        logger.info("   [WAIT] %s concurrency limit reached, %d request(s) queued", self.name, queued)
+        return False
+
+    def _release(self):
+        """Hand the slot to the oldest waiter, or free it if nobody is waiting"""
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            waiter = self._waiters.popleft()
+
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(self._hand_over, future)
+        except RuntimeError:
+            # The waiter's loop is already closed
+            self._release()
+
+    def _hand_over(self, future: asyncio.Future):
+        """Wake an async waiter on its own loop, passing the slot on if it gave up meanwhile"""
+        if future.done():
+            self._release()
+        else:
+            future.set_result(None)
+
+    def _abandon(self, waiter):
+        """Drop a cancelled async waiter, returning its slot if one was already handed over"""
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                return
+            except ValueError:
+                pass
+        # Already dequeued: a cancelled future gets its slot passed on by _hand_over
+        future = waiter[1]
+        if future.done() and not future.cancelled():
+            self._release()
+
+    def _reserve_slot(self) -> float:
+        """Claim the next start time and return how long to wait for it"""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        return slot - now
+
+
+# Global instances, tuned through the environment to match the account tier
+# (the Gemini default matches the free tier's 5 requests per minute)
+llm_rate_limiters = {
+    'gemini': LLMRateLimiter(
+        "Gemini",
+        int(os.getenv('GEMINI_MAX_CONCURRENCY', '3')),
+        float(os.getenv('GEMINI_RPM', '5'))
+    ),
+    'openai': LLMRateLimiter(
+        "OpenAI",
+        int(os.getenv('OPENAI_MAX_CONCURRENCY', '8')),
+        float(os.getenv('OPENAI_RPM', '0'))
+    ),
+}
@@ -0,0 +1,95 @@
+"""
+Persistent per-stage cache for the individual ticker analyzers
+"""
+
+import functools
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable
+
+from src.utils.disk_cache import PersistentLRUCache
+
+logger = logging.getLogger(__name__)
+
+# time.monotonic() at the start of a forced re-run in progress, None otherwise;
+# copied into asyncio.to_thread workers
+_refreshing = ContextVar('stage_cache_refreshing', default=None)
+
+
+class StageCache(PersistentLRUCache):
+    """Disk-backed cache of analyzer results with an in-memory LRU front
+
+    Each (ticker, stage) result is stored on its own, so a rerun after a
+    partial failure only repeats the stages that did not succeed. Entries
+    expire after ttl_days, matching the whole-report cache policy.
+    """
+
+    name = "stage cache"
+
+    def __init__(self, cache_dir: str = "~/.cache/ai-ticker/stages", ttl_days: int = 15, max_memory_entries: int = 128):
+        super().__init__(cache_dir, max_memory_entries)
+        self.ttl_seconds = ttl_days * 86400
+
+    def make_key(self, ticker: str, stage: str) -> str:
+        """Build the cache key for one analyzer stage of a ticker"""
+        return hashlib.sha1(f"{ticker.upper()}|{stage}".encode('utf-8')).hexdigest()
+
+    def is_expired(self, entry: Dict[str, Any]) -> bool:
+        """Stage results expire ttl_days after they were stored"""
+        return time.time() - entry['stored_ts'] > self.ttl_seconds
+
+    def get(self, ticker: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry ({'stored_at', 'result'}) or None if missing, expired or refreshing"""
+        if _refreshing.get() is not None:
+            return None
+        return self.load(self.make_key(ticker, stage))
+
+    def set(self, ticker: str, stage: str, result: Dict[str, Any]):
+        """Store a stage result in memory and on disk"""
+        # Store a copy: callers annotate the returned dict (e.g. RAG context) after this
+        entry = {'stored_at': datetime.now().isoformat(), 'stored_ts': time.time(), 'result': dict(result)}
+        self.store(self.make_key(ticker, stage), entry)
+
+    @contextmanager
+    def refreshing(self, enabled: bool = True):
+        """Skip lookups (results are still written) for stage calls made inside the block"""
+        token = _refreshing.set(time.monotonic() if enabled else None)
+        try:
+            yield
+        finally:
+            _refreshing.reset(token)
+
+    def refresh_started(self) -> Optional[float]:
+        """time.monotonic() at which the enclosing refreshing() block began, or None outside one"""
+        return _refreshing.get()
+
+
+# Global instance
+stage_cache = StageCache()
+
+
+def cached_stage(stage: str) -> Callable:
+    """Decorate an analyzer method taking a ticker so successful results are reused
+
+    Results carrying an 'error' key are not cached, so failed stages are
+    retried on the next run.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, ticker: str) -> Dict[str, Any]:
+            entry = stage_cache.get(ticker, stage)
+            if entry is not None:
+                logger.info("   [CACHE] Reusing %s analysis from %s", stage, entry['stored_at'])
+                # Callers annotate the top-level dict (e.g. RAG context), keep the cached copy clean
+                return dict(entry['result'])
+
+            result = method(self, ticker)
+            if isinstance(result, dict) and 'error' not in result:
+                stage_cache.set(ticker, stage, result)
+            return result
+        return wrapper
+    return decorator
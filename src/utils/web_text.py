@@ -0,0 +1,42 @@
+"""
+Fetching web pages as plain text for the analyzers
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+from src.config import http_client
+
+try:
+    import lxml  # noqa: F401 - C parser for BeautifulSoup
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Only the start of a page is used, so large pages are not downloaded in full
+MAX_PAGE_BYTES = 200_000
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fetch_page_text(url: str, max_chars: int, timeout: float = 10) -> str:
+    """Download a page and return its visible text with whitespace collapsed, up to max_chars"""
+    content = bytearray()
+    with http_client.stream('GET', url, headers=SCRAPE_HEADERS, timeout=timeout, follow_redirects=True) as response:
+        for chunk in response.iter_bytes():
+            content += chunk
+            if len(content) >= MAX_PAGE_BYTES:
+                break
+    
+    soup = BeautifulSoup(bytes(content[:MAX_PAGE_BYTES]), HTML_PARSER)
+    
+    # Remove scripts and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    return _WHITESPACE.sub(' ', soup.get_text(separator=' ')).strip()[:max_chars]
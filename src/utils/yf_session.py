@@ -0,0 +1,39 @@
+"""
+Shared HTTP session for yfinance requests
+"""
+
+import requests
+import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
+
+def _create_session():
+    """One keep-alive session for every Ticker, so TLS connections are reused across tickers
+
+    Current yfinance only accepts curl_cffi sessions (and installs curl_cffi);
+    older requests-based releases get a pooled session with retries instead.
+    """
+    if CURL_CFFI_AVAILABLE:
+        return curl_requests.Session(impersonate="chrome")
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.3))
+    session.mount("https://", adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+
+def get_ticker(ticker: str) -> yf.Ticker:
+    """yf.Ticker bound to the shared session"""
+    return yf.Ticker(ticker, session=yf_session)
+
+
+# Global instance
+yf_session = _create_session()
@@ -3,60 +3,84 @@ LangGraph workflow for multi-agent ticker analysis with RAG integration
 """
 
 import json
-from typing import Dict, Any, Optional, List
+import operator
+from typing import Dict, Any, Optional, List, TypedDict, Annotated, TYPE_CHECKING
 from datetime import datetime
 import asyncio
+import time
+import uuid
 
 try:
     from langgraph.graph import StateGraph, END
-    from langgraph.checkpoint.memory import MemorySaver
+    from langchain_core.runnables import RunnableConfig
+    try:
+        from langgraph.types import Send
+    except ImportError:  # older langgraph releases
+        from langgraph.constants import Send
     LANGGRAPH_AVAILABLE = True
 except ImportError:
     LANGGRAPH_AVAILABLE = False
+    RunnableConfig = Dict[str, Any]
     print("[WARN] LangGraph not available. Install with: pip install langgraph")
 
-from ..config.display_config import safe_format
+from ..utils.display_config import safe_format
 from ..tool.RAG.vector_store import knowledge_store
-from ..agent.ticker_analyzer import MultiAgentTickerAnalyzer
 
+if TYPE_CHECKING:
+    from ..agent.ticker_analyzer import TickerAnalyzerAgent
 
-class AnalysisState(dict):
-    """State class for the analysis workflow"""
+
+class AnalysisState(TypedDict, total=False):
+    """State for the analysis workflow
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Required fields
-        self.setdefault('ticker', '')
-        self.setdefault('company_name', '')
-        self.setdefault('current_step', 'validation')
-        self.setdefault('results', {})
-        self.setdefault('context', {})
-        self.setdefault('errors', [])
-        self.setdefault('completed_analyses', [])
+    The analysis nodes run in parallel, so every key they write carries a
+    reducer that merges the branch outputs instead of overwriting them.
+    """
+    ticker: str
+    company_name: str
+    config: Dict[str, Any]
+    current_step: str
+    context: Dict[str, Any]
+    started_at: float
+    results: Annotated[Dict[str, Any], operator.or_]
+    errors: Annotated[List[str], operator.add]
+    completed_analyses: Annotated[List[str], operator.add]
+    final_result: Dict[str, Any]
 
 
 class TickerAnalysisWorkflow:
-    """LangGraph-based workflow for ticker analysis"""
+    """LangGraph-based workflow for ticker analysis
+    
+    The compiled graph is shared by every instance in the process. Nodes look
+    up the analyzer of the current run in config['configurable']['analyzer'],
+    so the graph itself carries no per-agent state.
+    """
     
-    def __init__(self, analyzer: MultiAgentTickerAnalyzer = None):
-        self.analyzer = analyzer or MultiAgentTickerAnalyzer()
+    _compiled_app = None
+    
+    def __init__(self, analyzer: 'TickerAnalyzerAgent' = None):
+        self.analyzer = analyzer
         self.workflow = None
         self.app = None
         
-        # Analysis steps mapping
+        # Analysis steps mapping: analysis type -> (analyzer attribute, method name)
         self.analysis_steps = {
-            'cash_flow': 'cash_flow_analyzer',
-            'profit': 'profit_analyzer', 
-            'ceo': 'ceo_analyzer',
-            'technology': 'technology_analyzer',
-            'sentiment': 'sentiment_analyzer'
+            'cash_flow': ('cash_flow_analyzer', 'analyze_cash_flow'),
+            'profit': ('profit_analyzer', 'analyze_profit_mechanisms'),
+            'ceo': ('ceo_analyzer', 'analyze_ceo_complete'),
+            'technology': ('technology_analyzer', 'analyze_technology_complete'),
+            'sentiment': ('sentiment_analyzer', 'analyze_sentiment_complete')
         }
         
         if LANGGRAPH_AVAILABLE:
             self._build_workflow()
     
     def _build_workflow(self):
-        """Build the LangGraph workflow"""
+        """Build the LangGraph workflow, compiling it only once per process"""
+        if TickerAnalysisWorkflow._compiled_app is not None:
+            self.app = TickerAnalysisWorkflow._compiled_app
+            return
+        
         workflow = StateGraph(AnalysisState)
         
         # Add nodes
@@ -83,124 +107,126 @@ class TickerAnalysisWorkflow:
             }
         )
         
-        workflow.add_edge("prepare_analysis", "cash_flow_analysis")
-        workflow.add_edge("cash_flow_analysis", "profit_analysis")
-        workflow.add_edge("profit_analysis", "ceo_analysis")
-        workflow.add_edge("ceo_analysis", "technology_analysis")
-        workflow.add_edge("technology_analysis", "sentiment_analysis")
-        workflow.add_edge("sentiment_analysis", "compile_results")
+        # Fan the independent analyses out in parallel, then join on compile_results
+        analysis_nodes = [f"{analysis_type}_analysis" for analysis_type in self.analysis_steps]
+        workflow.add_conditional_edges("prepare_analysis", self._dispatch_analyses, analysis_nodes)
+        for node in analysis_nodes:
+            workflow.add_edge(node, "compile_results")
         workflow.add_edge("compile_results", END)
         workflow.add_edge("handle_error", END)
         
-        # Compile workflow
-        memory = MemorySaver()
-        self.app = workflow.compile(checkpointer=memory)
+        # Compile workflow; no checkpointer, since nothing reads past states back and a
+        # process-wide saver would keep every run's full state alive
+        self.app = TickerAnalysisWorkflow._compiled_app = workflow.compile()
         
         print(safe_format("[OK] LangGraph workflow compiled successfully"))
     
+    def _get_analyzer(self, config: RunnableConfig) -> 'TickerAnalyzerAgent':
+        """Return the analyzer driving the current run"""
+        return (config or {}).get('configurable', {}).get('analyzer') or self.analyzer
+    
     def _validation_router(self, state: AnalysisState) -> str:
         """Route based on validation result"""
         return "valid" if not state.get('errors') else "invalid"
     
-    async def validate_ticker(self, state: AnalysisState) -> AnalysisState:
+    def _dispatch_analyses(self, state: AnalysisState) -> List['Send']:
+        """Send the prepared state to every analysis node at once"""
+        return [Send(f"{analysis_type}_analysis", state) for analysis_type in self.analysis_steps]
+    
+    async def validate_ticker(self, state: AnalysisState, config: RunnableConfig) -> Dict[str, Any]:
         """Validate ticker and basic data"""
         ticker = state['ticker']
         
         print(safe_format(f"[VALIDATE] Checking ticker: {ticker}"))
         
         # Get RAG context for validation
-        validation_context = knowledge_store.get_context_for_analysis(
+        validation_context = await asyncio.to_thread(
+            knowledge_store.get_context_for_analysis,
             "investment", 
             {"ticker": ticker}
         )
         
         # Use analyzer's validation
-        test_data = self.analyzer.cash_flow_analyzer.get_financial_data(ticker)
+        test_data = await asyncio.to_thread(self._get_analyzer(config).cash_flow_analyzer.get_financial_data, ticker)
         
         if 'error' in test_data:
-            state['errors'].append(test_data['error'])
-            state['current_step'] = 'error'
-        else:
-            state['current_step'] = 'validation_passed'
-            state['context']['company_data'] = test_data
-            state['company_name'] = test_data.get('longName', ticker)
-            
-            if validation_context:
-                state['context']['validation_knowledge'] = validation_context
+            return {'errors': [test_data['error']], 'current_step': 'error'}
+        
+        company_info = test_data.get('company_info', {})
+        context = {'company_data': company_info}
+        if validation_context:
+            context['validation_knowledge'] = validation_context
         
-        return state
+        return {
+            'current_step': 'validation_passed',
+            'context': context,
+            'company_name': state.get('company_name') or company_info.get('longName', ticker)
+        }
     
-    async def prepare_analysis(self, state: AnalysisState) -> AnalysisState:
+    async def prepare_analysis(self, state: AnalysisState) -> Dict[str, Any]:
         """Prepare for analysis with RAG context"""
         print(safe_format("[PREPARE] Setting up analysis context"))
         
-        # Get comprehensive RAG context for all analysis types
-        for analysis_type in self.analysis_steps.keys():
-            context = knowledge_store.get_context_for_analysis(
-                analysis_type,
-                state['context'].get('company_data', {})
+        context = dict(state.get('context', {}))
+        use_rag = state.get('config', {}).get('use_rag', True)
+        
+        # Get comprehensive RAG context for all analysis types (and the final
+        # investment framework) with one batched search
+        if use_rag:
+            rag_contexts = await asyncio.to_thread(
+                knowledge_store.get_contexts_for_analyses,
+                list(self.analysis_steps.keys()) + ['investment'],
+                context.get('company_data', {})
             )
-            if context:
-                state['context'][f'{analysis_type}_knowledge'] = context
+            for analysis_type, rag_context in rag_contexts.items():
+                if rag_context:
+                    context[f'{analysis_type}_knowledge'] = rag_context
         
-        state['current_step'] = 'analysis_prepared'
-        return state
+        return {'context': context, 'current_step': 'analysis_prepared'}
     
-    async def cash_flow_analysis(self, state: AnalysisState) -> AnalysisState:
+    async def cash_flow_analysis(self, state: AnalysisState, config: RunnableConfig) -> AnalysisState:
         """Perform cash flow analysis with RAG enhancement"""
-        return await self._perform_analysis(state, 'cash_flow', 'Cash Flow Analysis')
+        return await self._perform_analysis(state, config, 'cash_flow', 'Cash Flow Analysis')
     
-    async def profit_analysis(self, state: AnalysisState) -> AnalysisState:
+    async def profit_analysis(self, state: AnalysisState, config: RunnableConfig) -> AnalysisState:
         """Perform profit analysis with RAG enhancement"""
-        return await self._perform_analysis(state, 'profit', 'Profit Analysis')
+        return await self._perform_analysis(state, config, 'profit', 'Profit Analysis')
     
-    async def ceo_analysis(self, state: AnalysisState) -> AnalysisState:
+    async def ceo_analysis(self, state: AnalysisState, config: RunnableConfig) -> AnalysisState:
         """Perform CEO analysis with RAG enhancement"""
-        return await self._perform_analysis(state, 'ceo', 'CEO Analysis')
+        return await self._perform_analysis(state, config, 'ceo', 'CEO Analysis')
     
-    async def technology_analysis(self, state: AnalysisState) -> AnalysisState:
+    async def technology_analysis(self, state: AnalysisState, config: RunnableConfig) -> AnalysisState:
         """Perform technology analysis with RAG enhancement"""
-        return await self._perform_analysis(state, 'technology', 'Technology Analysis')
+        return await self._perform_analysis(state, config, 'technology', 'Technology Analysis')
     
-    async def sentiment_analysis(self, state: AnalysisState) -> AnalysisState:
+    async def sentiment_analysis(self, state: AnalysisState, config: RunnableConfig) -> AnalysisState:
         """Perform sentiment analysis with RAG enhancement"""
-        return await self._perform_analysis(state, 'sentiment', 'Sentiment Analysis')
+        return await self._perform_analysis(state, config, 'sentiment', 'Sentiment Analysis')
     
-    async def _perform_analysis(self, state: AnalysisState, analysis_type: str, display_name: str) -> AnalysisState:
-        """Generic analysis performer with RAG integration"""
+    async def _perform_analysis(self, state: AnalysisState, config: RunnableConfig, analysis_type: str, display_name: str) -> Dict[str, Any]:
+        """Generic analysis performer with RAG integration
+        
+        Runs in parallel with the other analysis nodes, so it only returns the
+        keys it owns and lets the state reducers merge them.
+        """
         ticker = state['ticker']
-        company_name = state.get('company_name', '')
         
         print(safe_format(f"[ANALYZE] {display_name} for {ticker}"))
         
         try:
             # Get the analyzer
-            analyzer_name = self.analysis_steps[analysis_type]
-            analyzer = getattr(self.analyzer, analyzer_name)
+            analyzer_name, method_name = self.analysis_steps[analysis_type]
+            analyzer = getattr(self._get_analyzer(config), analyzer_name)
             
             # Get RAG context
-            rag_context = state['context'].get(f'{analysis_type}_knowledge', '')
+            rag_context = state.get('context', {}).get(f'{analysis_type}_knowledge', '')
             
-            # Perform analysis with enhanced context
-            if hasattr(analyzer, 'analyze_with_context'):
-                # If analyzer supports RAG context
-                result = analyzer.analyze_with_context(
-                    ticker, 
-                    company_name,
-                    context=rag_context
-                )
-            else:
-                # Fallback to normal analysis
-                if analysis_type == 'cash_flow':
-                    result = analyzer.analyze_cash_flow_and_revenue(ticker, company_name)
-                elif analysis_type == 'profit':
-                    result = analyzer.analyze_profit_margins(ticker, company_name)
-                elif analysis_type == 'ceo':
-                    result = analyzer.analyze_ceo_performance(ticker, company_name)
-                elif analysis_type == 'technology':
-                    result = analyzer.analyze_technology_competitive_advantage(ticker, company_name)
-                elif analysis_type == 'sentiment':
-                    result = analyzer.analyze_market_sentiment(ticker, company_name)
+            # The analyzers are blocking (yfinance / HTTP), run them off the event loop
+            result = await asyncio.to_thread(getattr(analyzer, method_name), ticker)
+            
+            if isinstance(result, dict) and 'error' in result:
+                raise RuntimeError(result['error'])
             
             # Store result with RAG context if available
             enriched_result = result.copy() if isinstance(result, dict) else {'analysis': result}
@@ -208,69 +234,88 @@ class TickerAnalysisWorkflow:
                 enriched_result['rag_context'] = rag_context
                 enriched_result['enhanced'] = True
             
-            state['results'][analysis_type] = enriched_result
-            state['completed_analyses'].append(analysis_type)
-            state['current_step'] = f'{analysis_type}_completed'
+            print(safe_format(f"   [OK] {display_name} completed"))
+            return {
+                'results': {analysis_type: enriched_result},
+                'completed_analyses': [analysis_type]
+            }
             
         except Exception as e:
             error_msg = f"Error in {display_name}: {str(e)}"
             print(safe_format(f"[FAIL] {error_msg}"))
-            state['errors'].append(error_msg)
-            state['results'][analysis_type] = {'error': error_msg}
-        
-        return state
+            return {
+                'results': {analysis_type: {'error': error_msg}},
+                'errors': [error_msg]
+            }
     
-    async def compile_results(self, state: AnalysisState) -> AnalysisState:
+    async def compile_results(self, state: AnalysisState, config: RunnableConfig) -> Dict[str, Any]:
         """Compile all analysis results"""
         print(safe_format("[COMPILE] Generating final report"))
         
+        analyzer = self._get_analyzer(config)        
+        use_rag = state.get('config', {}).get('use_rag', True)
+        results = state.get('results', {})
+        
         # Get investment context from RAG
-        investment_context = knowledge_store.get_context_for_analysis(
-            "investment",
-            state['context'].get('company_data', {})
-        )
+        investment_context = ''
+        if use_rag:
+            investment_context = state.get('context', {}).get('investment_knowledge')
+            if investment_context is None:
+                investment_context = await asyncio.to_thread(
+                    knowledge_store.get_context_for_analysis,
+                    "investment",
+                    state.get('context', {}).get('company_data', {})
+                )
         
-        # Use analyzer's compilation method
         final_result = {
             'ticker': state['ticker'],
             'company_name': state.get('company_name', ''),
             'analysis_timestamp': datetime.now().isoformat(),
-            'workflow_version': '1.0',
-            'rag_enhanced': True,
-            'completed_analyses': state['completed_analyses'],
-            'individual_results': state['results'],
+            'llm_used': analyzer.llm_type,
+            'workflow_version': '1.1',
+            'completed_analyses': state.get('completed_analyses', []),
+            'individual_results': results,
             'investment_framework': investment_context if investment_context else '',
-            'errors': state['errors']
+            'errors': state.get('errors', []),
+            'company_info': {},
+            'analysis_status': {}
         }
         
-        # Add comprehensive summary
-        if len(state['completed_analyses']) >= 3:
-            summary_parts = []
-            for analysis in state['completed_analyses']:
-                result = state['results'].get(analysis, {})
-                if isinstance(result, dict) and 'analysis' in result:
-                    summary_parts.append(f"{analysis.title()}: {result['analysis'][:200]}...")
-            
-            final_result['executive_summary'] = ' | '.join(summary_parts)
+        # Lay the results out the same way the sequential path does
+        for analysis_type in self.analysis_steps:
+            result = results.get(analysis_type, {})
+            if 'error' in result:
+                final_result[f'{analysis_type}_analysis'] = {}
+                final_result['analysis_status'][analysis_type] = f"failed: {result['error']}"
+            else:
+                final_result[f'{analysis_type}_analysis'] = result
+                final_result['analysis_status'][analysis_type] = 'completed'
+        
+        if 'analysis_summary' in final_result['cash_flow_analysis']:
+            final_result['company_info'].update(final_result['cash_flow_analysis']['analysis_summary'])
         
-        state['final_result'] = final_result
-        state['current_step'] = 'completed'
+        # Insights, scores and reports are shared with the sequential path
+        await analyzer._finalize_analysis_async(
+            final_result, state['ticker'], use_rag, investment_context
+        )
+        final_result['analysis_duration'] = f"{time.time() - state.get('started_at', time.time()):.2f} seconds"
         
-        return state
+        return {'final_result': final_result, 'current_step': 'completed'}
     
-    async def handle_error(self, state: AnalysisState) -> AnalysisState:
+    async def handle_error(self, state: AnalysisState) -> Dict[str, Any]:
         """Handle errors in the workflow"""
-        print(safe_format(f"[ERROR] Analysis failed: {state['errors']}"))
+        errors = state.get('errors', [])
+        print(safe_format(f"[ERROR] Analysis failed: {errors}"))
         
-        state['final_result'] = {
+        final_result = {
             'ticker': state['ticker'],
             'analysis_status': 'failed',
-            'errors': state['errors'],
+            'error': errors[0] if errors else 'Unknown workflow error',
+            'errors': errors,
             'timestamp': datetime.now().isoformat()
         }
-        state['current_step'] = 'error_handled'
         
-        return state
+        return {'final_result': final_result, 'current_step': 'error_handled'}
     
     def get_workflow_visualization(self) -> Dict[str, Any]:
         """Get workflow structure for visualization"""
@@ -296,11 +341,15 @@ class TickerAnalysisWorkflow:
             "edges": [
                 {"from": "validate_ticker", "to": "prepare_analysis", "condition": "valid"},
                 {"from": "validate_ticker", "to": "handle_error", "condition": "invalid"},
-                {"from": "prepare_analysis", "to": "cash_flow_analysis"},
-                {"from": "cash_flow_analysis", "to": "profit_analysis"},
-                {"from": "profit_analysis", "to": "ceo_analysis"},
-                {"from": "ceo_analysis", "to": "technology_analysis"},
-                {"from": "technology_analysis", "to": "sentiment_analysis"},
+                {"from": "prepare_analysis", "to": "cash_flow_analysis", "condition": "parallel"},
+                {"from": "prepare_analysis", "to": "profit_analysis", "condition": "parallel"},
+                {"from": "prepare_analysis", "to": "ceo_analysis", "condition": "parallel"},
+                {"from": "prepare_analysis", "to": "technology_analysis", "condition": "parallel"},
+                {"from": "prepare_analysis", "to": "sentiment_analysis", "condition": "parallel"},
+                {"from": "cash_flow_analysis", "to": "compile_results"},
+                {"from": "profit_analysis", "to": "compile_results"},
+                {"from": "ceo_analysis", "to": "compile_results"},
+                {"from": "technology_analysis", "to": "compile_results"},
                 {"from": "sentiment_analysis", "to": "compile_results"},
                 {"from": "compile_results", "to": "END"},
                 {"from": "handle_error", "to": "END"}
@@ -325,25 +374,35 @@ class TickerAnalysisWorkflow:
         initial_state = AnalysisState(
             ticker=ticker.upper(),
             company_name=company_name or '',
-            config=config or {}
+            config=config or {},
+            current_step='validation',
+            context={},
+            started_at=time.time(),
+            results={},
+            errors=[],
+            completed_analyses=[]
         )
         
         try:
             # Run workflow
-            config = {"configurable": {"thread_id": f"analysis_{ticker}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"}}
+            config = {"configurable": {
+                # Unique per run, so a rerun of the same ticker never resumes an earlier thread
+                "thread_id": f"analysis_{ticker}_{uuid.uuid4().hex}",
+                "analyzer": self.analyzer
+            }}
             
-            final_state = None
-            async for state in self.app.astream(initial_state, config):
-                final_state = state
-                # Print progress
-                current_step = list(state.keys())[0] if state else "unknown"
-                if current_step != "END":
+            final_result = None
+            async for update in self.app.astream(initial_state, config):
+                # Each update maps the node that just finished to the keys it wrote
+                for current_step, node_output in update.items():
                     print(safe_format(f"[WORKFLOW] Completed step: {current_step}"))
+                    if isinstance(node_output, dict) and 'final_result' in node_output:
+                        final_result = node_output['final_result']
             
-            return final_state.get('final_result', {
+            return final_result or {
                 'error': 'Workflow completed but no final result',
                 'ticker': ticker
-            })
+            }
             
         except Exception as e:
             print(safe_format(f"[ERROR] Workflow execution failed: {e}"))
@@ -359,12 +418,9 @@ class TickerAnalysisWorkflow:
         print(safe_format("[FALLBACK] Running sequential analysis"))
         
         # Use the original analyzer
-        return self.analyzer.analyze_ticker_comprehensive(
+        return await self.analyzer.analyze_ticker_comprehensive_async(
             ticker, 
             company_name, 
-            force_new=False
-        )
-
-
-# Global workflow instance
-analysis_workflow = TickerAnalysisWorkflow()
\ No newline at end of file
+            force_new=False,
+            use_workflow=False
+        )
\ No newline at end of file
@@ -18,7 +18,7 @@ except ImportError:
     PLOTLY_AVAILABLE = False
     print("[WARN] Plotly not available. Install with: pip install plotly")
 
-from ..config.display_config import safe_format
+from ..utils.display_config import safe_format
 
 
 class WorkflowVisualizer:
@@ -268,7 +268,7 @@ class WorkflowVisualizer:
         levels = {
             'validate_ticker': 0,
             'prepare_analysis': 1,
-            'cash_flow_analysis': 2,
+            'cash_flow_analysis': 2.5,
             'profit_analysis': 2.5,
             'ceo_analysis': 2.5,
             'technology_analysis': 2.5,